@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Bootstrap confidence intervals for per-run metrics.
+
+Runs are resampled with replacement using index matrices: one (resamples, n)
+matrix per group and chunk, so a single fancy-indexing operation produces every
+resampled dataset and the statistics are plain axis reductions. For each metric
+this gives percentile intervals for the mean and median of both groups, for
+their difference (Enhanced - Baseline, like the report tables) and for the
+Vargha-Delaney A12.
+
+Work is split into fixed-size chunks and every chunk gets its own random
+stream, derived from the seed, the metric name and the chunk number. Results
+are therefore reproducible and do not depend on how many worker processes
+computed them.
+"""
+
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+CHUNK_RESAMPLES = 2000
+
+# Bounds the (rows, n1, n2) comparison tensor used for A12.
+_A12_BLOCK_ELEMENTS = 1 << 22
+
+
+def _chunk_seed(seed, name, chunk):
+    return np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode('utf-8')), chunk))
+
+
+def _resampled_a12(x, y):
+    """
+    A12 of every row pair of the (resamples, n1) / (resamples, n2) matrices x and y
+    (ties count half), compared pairwise in blocks of rows to bound memory.
+    """
+    a12 = np.empty(x.shape[0])
+    step = max(1, _A12_BLOCK_ELEMENTS // max(1, x.shape[1] * y.shape[1]))
+    for start in range(0, x.shape[0], step):
+        xs = x[start:start + step, :, None]
+        ys = y[start:start + step, None, :]
+        wins = (xs > ys).sum(axis=(1, 2)) + 0.5 * (xs == ys).sum(axis=(1, 2))
+        a12[start:start + step] = wins / (x.shape[1] * y.shape[1])
+    return a12
+
+
+def _bootstrap_chunk(baseline, enhanced, resamples, seed_seq):
+    """
+    Worker: statistics of `resamples` bootstrap replicates of one metric.
+    Returns a dict of arrays, one value per replicate.
+    """
+    rng = np.random.default_rng(seed_seq)
+    baseline = np.asarray(baseline, dtype=float)
+    enhanced = np.asarray(enhanced, dtype=float)
+    b = baseline[rng.integers(0, len(baseline), size=(resamples, len(baseline)))]
+    e = enhanced[rng.integers(0, len(enhanced), size=(resamples, len(enhanced)))]
+    return {
+        'baseline_mean': b.mean(axis=1),
+        'baseline_median': np.median(b, axis=1),
+        'enhanced_mean': e.mean(axis=1),
+        'enhanced_median': np.median(e, axis=1),
+        'a12': _resampled_a12(e, b),
+    }
+
+
+def _interval(values, confidence):
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(values, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def bootstrap_metrics(metrics, resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE, seed=0, jobs=1):
+    """
+    Bootstrap every metric in `metrics`, a {name: (baseline_values, enhanced_values)} dict.
+    Metrics with an empty group are skipped. With jobs > 1 the chunks of all
+    metrics are spread over a process pool.
+    Returns {name: {'baseline': {'mean': (lo, hi), 'median': (lo, hi)},
+                    'enhanced': {...}, 'difference': {...}, 'a12': (lo, hi)}}.
+    """
+    tasks = []
+    for name, (baseline, enhanced) in metrics.items():
+        if len(baseline) == 0 or len(enhanced) == 0:
+            continue
+        for chunk, start in enumerate(range(0, resamples, CHUNK_RESAMPLES)):
+            size = min(CHUNK_RESAMPLES, resamples - start)
+            tasks.append((name, baseline, enhanced, size, _chunk_seed(seed, name, chunk)))
+
+    args = list(zip(*tasks))[1:] if tasks else [(), (), (), ()]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunks = list(executor.map(_bootstrap_chunk, *args))
+    else:
+        chunks = [_bootstrap_chunk(*task[1:]) for task in tasks]
+
+    replicates = {}
+    for (name, *_), chunk in zip(tasks, chunks):
+        collected = replicates.setdefault(name, {key: [] for key in chunk})
+        for key, values in chunk.items():
+            collected[key].append(values)
+
+    intervals = {}
+    for name, collected in replicates.items():
+        values = {key: np.concatenate(parts) for key, parts in collected.items()}
+        intervals[name] = {
+            'baseline': {
+                'mean': _interval(values['baseline_mean'], confidence),
+                'median': _interval(values['baseline_median'], confidence),
+            },
+            'enhanced': {
+                'mean': _interval(values['enhanced_mean'], confidence),
+                'median': _interval(values['enhanced_median'], confidence),
+            },
+            'difference': {
+                'mean': _interval(values['enhanced_mean'] - values['baseline_mean'], confidence),
+                'median': _interval(values['enhanced_median'] - values['baseline_median'], confidence),
+            },
+            'a12': _interval(values['a12'], confidence),
+        }
+    return intervals
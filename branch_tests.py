@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Per-branch hit-rate tests between two tools.
+
+Every branch is summarised by how many runs of each tool hit it (k1 of n1 vs
+k2 of n2), i.e. a 2x2 table. Because n1 and n2 are the same for all branches,
+the Fisher exact null distribution of a branch only depends on its total
+K = k1 + k2. Branches are therefore grouped by their (k1, k2) pair, and each
+distinct K gets one hypergeometric pmf over its support, computed from a
+log-factorial table. Testing 10^5 branches costs one np.unique plus at most
+n1 + n2 + 1 small array operations.
+
+benjamini_hochberg() turns the p-values into FDR-adjusted q-values, and
+sweep_consistency_thresholds() counts the "hit in >= high runs vs < low runs"
+buckets for a whole grid of thresholds from one 2-D histogram of hit counts.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+ALTERNATIVES = ('two-sided', 'greater', 'less')
+
+# Relative tolerance when collecting tables "at least as extreme" as the
+# observed one for the two-sided p-value (same as scipy.stats.fisher_exact).
+_TWO_SIDED_RTOL = 1 + 1e-7
+
+HIGH_FRACTIONS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+LOW_FRACTIONS = (0.1, 0.25, 0.4, 0.5)
+
+FisherResult = namedtuple('FisherResult', ['p_value', 'rate1', 'rate2'])
+FisherResult.__doc__ = """
+Per-branch arrays: p_value of Fisher's exact test and the hit rates k1 / n1 and
+k2 / n2. 'greater' tests whether tool 1 hits the branch in a larger share of runs.
+"""
+
+
+def _log_factorials(n):
+    return np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n + 1, dtype=float)))])
+
+
+def fisher_exact_counts(k1, n1, k2, n2, alternative='two-sided'):
+    """
+    Fisher's exact test of hit counts k1 (out of n1 runs) against k2 (out of n2
+    runs) for every branch at once. k1 and k2 are arrays of equal length.
+    Returns a FisherResult of per-branch arrays.
+    """
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}")
+    k1 = np.asarray(k1, dtype=np.int64)
+    k2 = np.asarray(k2, dtype=np.int64)
+    if k1.shape != k2.shape:
+        raise ValueError(f"Got {k1.shape} and {k2.shape} hit count arrays")
+    if np.any((k1 < 0) | (k1 > n1) | (k2 < 0) | (k2 > n2)):
+        raise ValueError("Hit counts must lie between 0 and the number of runs")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate1 = k1 / n1
+        rate2 = k2 / n2
+    if n1 == 0 or n2 == 0:
+        return FisherResult(np.full(k1.shape, np.nan), rate1, rate2)
+
+    # Distinct (k1, k2) tables; p-values are computed once per table.
+    codes, inverse = np.unique(k1 * (n2 + 1) + k2, return_inverse=True)
+    table_k1, table_total = codes // (n2 + 1), codes // (n2 + 1) + codes % (n2 + 1)
+    table_p = np.empty(len(codes))
+
+    log_fact = _log_factorials(n1 + n2)
+    for total in np.unique(table_total):
+        rows = np.flatnonzero(table_total == total)
+        low, high = max(0, total - n2), min(n1, total)
+        x = np.arange(low, high + 1)
+        log_pmf = (log_fact[n1] - log_fact[x] - log_fact[n1 - x]
+                   + log_fact[n2] - log_fact[total - x] - log_fact[n2 - total + x]
+                   - log_fact[n1 + n2] + log_fact[total] + log_fact[n1 + n2 - total])
+        pmf = np.exp(log_pmf)
+        observed = table_k1[rows] - low
+        if alternative == 'greater':
+            table_p[rows] = np.cumsum(pmf[::-1])[::-1][observed]
+        elif alternative == 'less':
+            table_p[rows] = np.cumsum(pmf)[observed]
+        else:
+            # Sum of every table no more likely than the observed one.
+            ordered = np.sort(pmf)
+            cumulative = np.cumsum(ordered)
+            position = np.searchsorted(ordered, pmf[observed] * _TWO_SIDED_RTOL, side='right')
+            table_p[rows] = cumulative[position - 1]
+
+    p_value = np.clip(table_p[inverse.ravel()].reshape(k1.shape), 0, 1)
+    return FisherResult(p_value, rate1, rate2)
+
+
+def benjamini_hochberg(p_values):
+    """
+    Benjamini-Hochberg FDR-adjusted q-values of a 1-D p-value array.
+    NaN p-values (untested branches) stay NaN and do not count as tests.
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    q_values = np.full(p_values.shape, np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    m = len(tested)
+    if m == 0:
+        return q_values
+    order = tested[np.argsort(p_values[tested], kind='stable')]
+    scaled = p_values[order] * m / np.arange(1, m + 1)
+    q_values[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return q_values
+
+
+def compare_branch_hit_rates(freq1, n1, freq2, n2, mask=None, fdr=0.05):
+    """
+    Two-sided Fisher test of every branch's hit rate (freq1 / n1 vs freq2 / n2,
+    hit_frequency arrays over one BranchIndex) with Benjamini-Hochberg
+    correction over the branches in `mask` (by default every branch hit by
+    at least one tool). Returns a dict of per-branch arrays (p_value, q_value,
+    rate1, rate2; NaN outside the mask) plus the boolean arrays
+    'significant', 'higher_in_1' and 'higher_in_2' at the given FDR level.
+    """
+    freq1 = np.asarray(freq1)
+    freq2 = np.asarray(freq2)
+    if mask is None:
+        mask = (freq1 > 0) | (freq2 > 0)
+    mask = np.asarray(mask, dtype=bool)
+
+    result = fisher_exact_counts(freq1, n1, freq2, n2)
+    p_value = np.where(mask, result.p_value, np.nan)
+    q_value = benjamini_hochberg(p_value)
+    significant = q_value <= fdr
+    return {
+        'p_value': p_value,
+        'q_value': q_value,
+        'rate1': result.rate1,
+        'rate2': result.rate2,
+        'significant': significant,
+        'higher_in_1': significant & (result.rate1 > result.rate2),
+        'higher_in_2': significant & (result.rate2 > result.rate1),
+    }
+
+
+def sweep_consistency_thresholds(freq1, n1, freq2, n2, highs, lows, mask=None):
+    """
+    Count the branches that tool 1 hits in >= high runs while tool 2 hits them in
+    < low runs (and the reverse) for every (high, low) pair of the grid.
+    All pairs come from one 2-D histogram of (freq1, freq2) over the branches
+    in `mask` and its cumulative sums.
+    Returns {(high, low): (count_1_over_2, count_2_over_1)}.
+    """
+    freq1 = np.asarray(freq1, dtype=np.int64)
+    freq2 = np.asarray(freq2, dtype=np.int64)
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        freq1, freq2 = freq1[mask], freq2[mask]
+
+    histogram = np.bincount(freq1 * (n2 + 1) + freq2, minlength=(n1 + 1) * (n2 + 1)).reshape(n1 + 1, n2 + 1)
+    # at_least_below[a, b] = #branches with freq1 >= a and freq2 < b (and transposed roles)
+    at_least_below = np.zeros((n1 + 2, n2 + 2), dtype=np.int64)
+    at_least_below[:n1 + 1, 1:] = np.cumsum(np.cumsum(histogram[::-1], axis=0)[::-1], axis=1)
+    below_at_least = np.zeros((n1 + 2, n2 + 2), dtype=np.int64)
+    below_at_least[1:, :n2 + 1] = np.cumsum(np.cumsum(histogram[:, ::-1], axis=1)[:, ::-1], axis=0)
+
+    def clamp(value, n):
+        return min(max(int(value), 0), n + 1)
+
+    return {
+        (high, low): (int(at_least_below[clamp(high, n1), clamp(low, n2)]),
+                      int(below_at_least[clamp(low, n1), clamp(high, n2)]))
+        for high in highs for low in lows
+    }
+
+
+def default_threshold_grid(runs):
+    """
+    Default (highs, lows) grid for `runs` runs, as fractions of the run count:
+    "high" from half of the runs up to all of them, "low" from 10% up to half.
+    For 20 runs this includes the report's fixed ">= 10 vs < 5" buckets.
+    """
+    highs = sorted({max(1, int(round(runs * fraction))) for fraction in HIGH_FRACTIONS})
+    lows = sorted({max(1, int(round(runs * fraction))) for fraction in LOW_FRACTIONS})
+    return highs, lows
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for the raw_browser_logs.txt console dumps of each run.
+
+Every entry is one line of the form
+    Sat Aug 09 16:45:17 UTC 2025 SEVERE http://webapp:8080/scripts/app.js 2:794 "message"
+i.e. a timestamp, the console level, the source URL, the JS location
+("line:col", or "-" when there is none) and the message. Lines that do not
+start with a timestamp (apart from the "---" header and footer) continue the
+previous entry's message, e.g. stack traces.
+
+iter_log_events() yields one LogEvent per entry and never holds more than one
+entry in memory. Entries at a fault level (SEVERE) get a fault key: the entry
+text after the level, normalized with the app's fault rules, i.e. the same
+string the run's unique_faults.txt contributes for that fault.
+
+Times are measured from the start of the run's test execution, taken from
+the Maven log of the suite (code-coverage-<app>-<k>.txt: "Finished at" minus
+"Total time"). The first console entry is no reference point: the browser
+only logs once something goes wrong, often right away.
+
+Entries matching an app's log noise patterns (infrastructure errors such as
+the dev server's livereload.js refusing connections) are counted separately
+and never become faults.
+
+summarize_run_log() reduces a whole file in that single streaming pass to a
+RunLog: counts and per-minute histograms per level, time to the first fault,
+and the first-seen time and count of every fault key. load_run_logs() does
+this for all runs of a tool, in a process pool when jobs > 1.
+"""
+
+import calendar
+import datetime
+import re
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from fault_normalizer import get_normalizer
+
+LOG_FILE = "raw_browser_logs.txt"
+FAULT_LEVELS = ('SEVERE',)
+# Display order of the console levels; unknown levels sort after these.
+LEVEL_ORDER = ('SEVERE', 'WARNING', 'INFO', 'DEBUG', 'CONFIG', 'FINE', 'FINER', 'FINEST', 'ALL')
+HISTOGRAM_BIN_SECONDS = 60
+# Fault entries caused by the test infrastructure rather than the app under test.
+DEFAULT_LOG_NOISE = (r'/livereload\.js\b',)
+
+_MONTHS = {name: i for i, name in enumerate(('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), start=1)}
+_ENTRY = re.compile(
+    r"^[A-Z][a-z]{2} ([A-Z][a-z]{2}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) ([A-Z]{2,5}) (\d{4}) ([A-Z]+) ?(.*)$"
+)
+_PAYLOAD = re.compile(r"^(\S+)\s+(\d+:\d+|-)(?:\s+(.*))?$")
+_MAVEN_LOG = re.compile(r"^code-coverage-.*\.txt$")
+_FINISHED_AT = re.compile(r"Finished at:\s*(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})")
+_TOTAL_TIME = re.compile(r"Total time:\s*([0-9:.]+)\s*(s|min|h)\b")
+
+LogEvent = namedtuple('LogEvent', ['timestamp', 'level', 'url', 'location', 'message', 'fault_key'])
+LogEvent.__doc__ = """
+One console entry: timestamp (Unix seconds, UTC), level, source URL and JS
+location ("line:col"; "" when the entry has none), message, and fault_key (the
+normalized fault string for entries at a FAULT_LEVELS level that are not log
+noise, else None).
+"""
+
+RunLog = namedtuple('RunLog', ['run_num', 'events', 'start', 'end', 'level_counts', 'level_bins',
+                               'first_fault', 'fault_first_seen', 'fault_counts', 'noise'])
+RunLog.__doc__ = """
+Streaming summary of one run's console log. start is the start of the test
+execution (Unix seconds; None if the Maven log gives none) and end the last
+entry's timestamp; level_counts is {level: entries}; level_bins
+{level: {minute: entries}} counts entries per HISTOGRAM_BIN_SECONDS since
+start (since the first entry without a start); first_fault is the seconds from
+start to the first fault entry (None if there is none or no start);
+fault_first_seen and fault_counts map every fault key to the seconds until it
+first appeared (None without a start) and its number of entries; noise counts
+the entries dropped as log noise.
+"""
+
+
+def _parse_timestamp(match, cache):
+    """Unix seconds of an entry's timestamp fields; all logs are written in UTC."""
+    key = match.group(1, 2, 3, 4, 5, 7)
+    stamp = cache.get(key)
+    if stamp is None:
+        month, day, hour, minute, second, year = key
+        stamp = calendar.timegm((int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second)))
+        if len(cache) > 100000:
+            cache.clear()
+        cache[key] = stamp
+    return stamp
+
+
+def _split_payload(payload):
+    """(url, location, message) of the text after the level."""
+    match = _PAYLOAD.match(payload)
+    if match is None:
+        return "", "", payload
+    url, location, message = match.groups()
+    return url, "" if location == "-" else location, message or ""
+
+
+def _noise_pattern(noise):
+    return re.compile("|".join(f"(?:{pattern})" for pattern in noise)) if noise else None
+
+
+def iter_log_events(lines, fault_rules=(), noise=DEFAULT_LOG_NOISE):
+    """
+    Generator of LogEvents from the lines of a raw_browser_logs.txt file
+    (any iterable of lines, e.g. an open file). Fault entries matching one of
+    the `noise` regexes get no fault key.
+    """
+    normalizer = get_normalizer(fault_rules)
+    noise_pattern = _noise_pattern(noise)
+    stamps = {}
+    pending = None   # (timestamp, level, payload lines) of the entry being read
+
+    def finish(entry):
+        timestamp, level, parts = entry
+        payload = "\n".join(parts)
+        url, location, message = _split_payload(parts[0])
+        if len(parts) > 1:
+            message = "\n".join([message] + parts[1:])
+        fault_key = None
+        if level in FAULT_LEVELS and (noise_pattern is None or noise_pattern.search(payload) is None):
+            fault_key = normalizer.normalize(payload)
+        return LogEvent(timestamp, level, url, location, message, fault_key)
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        match = _ENTRY.match(line)
+        if match is not None:
+            if pending is not None:
+                yield finish(pending)
+            pending = (_parse_timestamp(match, stamps), match.group(8), [match.group(9).strip()])
+        elif line.startswith("---") or not line.strip():
+            continue
+        elif pending is not None:
+            pending[2].append(line.rstrip())
+    if pending is not None:
+        yield finish(pending)
+
+
+def read_log_events(file_path, fault_rules=(), noise=DEFAULT_LOG_NOISE):
+    """Generator of the LogEvents of one log file, read line by line."""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from iter_log_events(f, fault_rules, noise)
+
+
+def _maven_seconds(value, unit):
+    """Seconds of a Maven "Total time" value such as "30.315 s", "03:47 min" or "1:02 h"."""
+    parts = [float(part) for part in value.split(":")]
+    if unit == 's':
+        return parts[-1]
+    if unit == 'min':
+        return parts[0] * 60 + (parts[1] if len(parts) > 1 else 0)
+    return parts[0] * 3600 + (parts[1] * 60 if len(parts) > 1 else 0) + (parts[2] if len(parts) > 2 else 0)
+
+
+def maven_start(file_path):
+    """
+    Unix start time of the last Maven build in a log ("Finished at" minus
+    "Total time"), or None if the log has no complete build summary.
+    """
+    finished = total = None
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = _TOTAL_TIME.search(line)
+            if match:
+                total = _maven_seconds(match.group(1), match.group(2))
+                continue
+            match = _FINISHED_AT.search(line)
+            if match:
+                finished = match.group(1)
+    if finished is None or total is None:
+        return None
+    stamp = datetime.datetime.strptime(finished, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+    return stamp.timestamp() - total
+
+
+def run_start(run):
+    """Start of a RunEntry's test execution from its suites' Maven logs (earliest suite), or None."""
+    starts = []
+    for suite in run.suites:
+        for name in suite.files:
+            if _MAVEN_LOG.match(name):
+                try:
+                    start = maven_start(suite.suite_dir / name)
+                except OSError:
+                    continue
+                if start is not None:
+                    starts.append(start)
+    return min(starts) if starts else None
+
+
+def event_table(events):
+    """
+    Column-oriented table of an iterable of LogEvents: a dict with a 'timestamp'
+    int64 array and object arrays 'level', 'url', 'location', 'message' and
+    'fault_key'.
+    """
+    columns = {field: [] for field in LogEvent._fields}
+    for event in events:
+        for field, value in zip(LogEvent._fields, event):
+            columns[field].append(value)
+    table = {'timestamp': np.array(columns.pop('timestamp'), dtype=np.int64)}
+    for field, values in columns.items():
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        table[field] = array
+    return table
+
+
+def summarize_run_log(run_num, file_path, fault_rules=(), noise=DEFAULT_LOG_NOISE, start=None):
+    """
+    RunLog of one log file, computed in a single streaming pass. start is the
+    run's start time (see run_start); without it no fault times are reported.
+    """
+    events = noise_entries = 0
+    first = end = None
+    level_counts = Counter()
+    level_bins = defaultdict(Counter)
+    fault_first_seen = {}
+    fault_counts = Counter()
+    for event in read_log_events(file_path, fault_rules, noise):
+        if first is None:
+            first = event.timestamp
+        end = event.timestamp
+        events += 1
+        level_counts[event.level] += 1
+        origin = first if start is None else start
+        level_bins[event.level][max(0, int((event.timestamp - origin) // HISTOGRAM_BIN_SECONDS))] += 1
+        if event.fault_key is not None:
+            fault_counts[event.fault_key] += 1
+            if event.fault_key not in fault_first_seen:
+                fault_first_seen[event.fault_key] = None if start is None else event.timestamp - start
+        elif event.level in FAULT_LEVELS:
+            noise_entries += 1
+    first_fault = None
+    if start is not None and fault_first_seen:
+        first_fault = min(fault_first_seen.values())
+    return RunLog(run_num, events, start, end, dict(level_counts),
+                  {level: dict(bins) for level, bins in level_bins.items()},
+                  first_fault, fault_first_seen, dict(fault_counts), noise_entries)
+
+
+def _summarize(run, file_path, fault_rules, noise):
+    try:
+        return summarize_run_log(run.run_num, file_path, fault_rules, noise, run_start(run)), None
+    except OSError as e:
+        return None, f"⚠️  Error reading {file_path}: {e}"
+
+
+def load_run_logs(manifest, fault_rules=(), jobs=1, noise=DEFAULT_LOG_NOISE):
+    """
+    RunLogs of every run in a RunManifest that has a raw_browser_logs.txt, in
+    run order. With jobs > 1 the files are parsed in a process pool.
+    """
+    runs = [run for run in manifest.runs if LOG_FILE in run.files]
+    for run in manifest.runs:
+        if LOG_FILE not in run.files:
+            print(f"⚠️  Missing browser log: {run.run_dir / LOG_FILE}")
+    paths = [run.run_dir / LOG_FILE for run in runs]
+    rules, noise = list(fault_rules), list(noise)
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            results = list(executor.map(_summarize, runs, paths, repeat(rules), repeat(noise)))
+    else:
+        results = [_summarize(run, path, rules, noise) for run, path in zip(runs, paths)]
+
+    run_logs = []
+    for run_log, error in results:
+        if error:
+            print(error)
+            continue
+        if run_log.start is None:
+            print(f"⚠️  {manifest.tool} run {run_log.run_num}: no test start in the Maven log, left out of the fault times")
+        run_logs.append(run_log)
+    return run_logs
+
+
+def level_order(levels):
+    """Levels sorted by LEVEL_ORDER, unknown ones alphabetically after them."""
+    rank = {level: i for i, level in enumerate(LEVEL_ORDER)}
+    return sorted(levels, key=lambda level: (rank.get(level, len(LEVEL_ORDER)), level))
+
+
+def level_histogram(run_logs, level):
+    """Mean entries of `level` per run in each HISTOGRAM_BIN_SECONDS bin since the run's start."""
+    bins = max((max(run_log.level_bins.get(level, {0: 0})) for run_log in run_logs), default=-1) + 1
+    counts = np.zeros((len(run_logs), bins))
+    for row, run_log in enumerate(run_logs):
+        for index, count in run_log.level_bins.get(level, {}).items():
+            counts[row, index] = count
+    return counts.mean(axis=0) if len(run_logs) else counts.sum(axis=0)
@@ -0,0 +1,1927 @@
+#!/usr/bin/env python3
+"""
+Baseline vs enhanced comparison engine shared by every application.
+
+What differs between applications (result folder layout, how fault strings are
+normalized, how many runs to consider) is described declaratively in
+APP_PROFILES, so one process can analyse several apps. Each app/tool dataset is
+loaded once through a DatasetStore and reused by every comparison that needs it.
+The per-app scripts (compare_dimeshift_v4.py, compare_retroboard_v4.py,
+past15runs/compare_dimeshift.py) are thin wrappers around main().
+"""
+
+import json
+import hashlib
+import sys
+import os
+from pathlib import Path
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import argparse
+import datetime
+import re
+import statistics
+import shutil
+import math
+
+import numpy as np
+
+from coverage_cache import CoverageCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_MB
+from coverage_ingest import read_run_coverage, merge_run_coverage, shared_layout
+from run_manifest import scan_tool_runs, RunManifest, DEFAULT_TOOL_DIR_PATTERN, DEFAULT_SUITE_PATTERN
+from rank_stats import mann_whitney_u
+from online_stats import OnlineSummary
+from bootstrap import bootstrap_metrics, DEFAULT_RESAMPLES, DEFAULT_CONFIDENCE
+from results_store import ResultsStore, run_signature, DEFAULT_RESULTS_DB
+from run_watcher import make_watcher
+from saturation import rarefaction_curve, pack_sets, runs_to_reach, curve_points, DEFAULT_ORDERINGS
+from prefix_stability import (prefix_points, prefix_metric_tests, prefix_unions, conclusion, stable_from,
+                              plot_prefix_stability, DEFAULT_MIN_RUNS, SIGNIFICANCE)
+from power_analysis import simulate_power, runs_needed, DEFAULT_SIMULATIONS, DEFAULT_TARGET_POWER, DEFAULT_RUN_COUNTS
+from fault_auc import read_discovery_curve, fault_auc_scores, find_mismatches, FAULT_CSV
+from coverage_timeline import (load_run_timeline, make_grid, resample, timeline_areas, horizon_normalized_auc,
+                               area_mismatches, timeline_bands, COVERAGE_METRICS, DEFAULT_GRID_POINTS)
+from fault_normalizer import get_normalizer
+from discovery_curves import load_discovery_curves, widen, discovery_bands, plot_discovery_curves, DEFAULT_BANDS
+from browser_logs import load_run_logs, level_order, level_histogram, LOG_FILE, FAULT_LEVELS, DEFAULT_LOG_NOISE
+from branch_tests import compare_branch_hit_rates, sweep_consistency_thresholds, default_threshold_grid
+from coverage_matrix import BranchIndex, build_location_index, build_hit_matrix, hit_frequency, RunBitsets, compare_tools
+
+AUC_METRICS = ('fault_scores', 'branch_coverage_auc', 'branch_coverage_final')
+
+# (metric key, label, alternative for Enhanced vs Baseline, interpretation) of the
+# metrics tested for statistical significance.
+STAT_METRICS = [
+    ('fault_scores', 'Fault Discovery Score', 'greater', 'Higher is better'),
+    ('branch_coverage_auc', 'Branch Coverage Growth (AUC)', 'less', 'Lower is better (faster)'),
+    ('branch_coverage_final', 'Final Branch Coverage', 'greater', 'Higher is better'),
+]
+
+# Shares of the final union for which the saturation section reports the runs needed.
+SATURATION_LEVELS = (0.9, 0.95, 0.99)
+
+# One entry per application.
+# tool_dir_pattern / suite_pattern are directory-name regexes with {app}/{tool}
+# placeholders; fault_rules normalize every unique_faults.txt line, each entry
+# the name of a fault_normalizer.FAULT_RULES rule or a (regex, replacement) pair;
+# log_noise are regexes of browser log faults caused by the test infrastructure;
+# max_runs keeps only the first N runs (None = all); complete_marker is the
+# suite-level file written when a run has finished.
+APP_PROFILES = {
+    'dimeshift': {
+        'title': 'Dimeshift',
+        'tool_dir_pattern': DEFAULT_TOOL_DIR_PATTERN,
+        'suite_pattern': DEFAULT_SUITE_PATTERN,
+        'fault_rules': ['api_timestamp'],
+        'log_noise': list(DEFAULT_LOG_NOISE),
+        'max_runs': None,
+        'complete_marker': "complete-{app}-0.txt",
+    },
+    'retroboard': {
+        'title': 'Retroboard',
+        'tool_dir_pattern': DEFAULT_TOOL_DIR_PATTERN,
+        'suite_pattern': DEFAULT_SUITE_PATTERN,
+        'fault_rules': ['js_line_col', 'versioned_js', 'api_timestamp'],
+        'log_noise': list(DEFAULT_LOG_NOISE),
+        'max_runs': None,
+        'complete_marker': "complete-{app}-0.txt",
+    },
+}
+
+
+def _load_run_coverage(run_num, coverage_paths, cache=None):
+    """
+    Worker for load_all_coverage_files: stream the coverage-final.json of every test
+    suite of one run and reduce it to hit vectors plus a layout, so the full
+    Istanbul dict is never built. Suites of the same run are merged by summing hits.
+    When a CoverageCache is given, a valid cache entry is used instead of parsing
+    the JSON, and freshly parsed files are written back to it.
+    Returns a (run_number, run_coverage, error_messages) tuple; run_coverage is
+    None when none of the run's files could be loaded.
+    """
+    suite_coverages = []
+    errors = []
+
+    for coverage_file in coverage_paths:
+        run_coverage = cache.get(coverage_file) if cache is not None else None
+        if run_coverage is None:
+            digest = hashlib.sha256() if cache is not None else None
+            try:
+                run_coverage = read_run_coverage(coverage_file, digest)
+            except json.JSONDecodeError as e:
+                errors.append(f"⚠️  Error parsing {coverage_file}: {e}")
+                continue
+            except Exception as e:
+                errors.append(f"⚠️  Error loading {coverage_file}: {e}")
+                continue
+            run_coverage['layout'] = shared_layout(run_coverage['layout'])
+            if cache is not None:
+                cache.put(coverage_file, run_coverage, digest.hexdigest())
+        suite_coverages.append(run_coverage)
+
+    if not suite_coverages:
+        return run_num, None, errors
+    return run_num, merge_run_coverage(suite_coverages), errors
+
+def load_all_coverage_files(manifest, jobs=1, cache=None):
+    """
+    Load all coverage files for the runs in a tool's RunManifest.
+    With jobs > 1 the JSON decoding is spread over a process pool; results are
+    still returned in run order.
+    Returns a list of (run_number, run_coverage) tuples, where run_coverage holds
+    the 'branches', 'statements' and 'functions' hit vectors of that run and the
+    'layout' they are aligned with. Runs with identical layouts share one copy.
+    """
+    coverage_files = []
+    suite_files, missing = manifest.suite_files("coverage-final.json")
+    for coverage_file in missing:
+        print(f"⚠️  Missing: {coverage_file}")
+
+    run_nums = [run_num for run_num, _ in suite_files]
+    run_paths = [paths for _, paths in suite_files]
+
+    if jobs > 1 and len(run_paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_load_run_coverage, run_nums, run_paths, repeat(cache)))
+    else:
+        results = [_load_run_coverage(run_num, paths, cache) for run_num, paths in zip(run_nums, run_paths)]
+
+    for run_num, run_coverage, errors in results:
+        for error in errors:
+            print(error, file=sys.stderr)
+        if run_coverage is None:
+            continue
+        run_coverage['layout'] = shared_layout(run_coverage['layout'])
+        coverage_files.append((run_num, run_coverage))
+        print(f"✅ Loaded {manifest.tool} run {run_num}")
+    
+    return coverage_files
+
+def aggregate_tool_coverage(coverage_files, branch_index):
+    """
+    Aggregate coverage across all runs for a tool.
+    The union is CORRECTLY defined as the branches that were actually HIT.
+    Returns (union, hit_matrix, hit_frequency, run_bitsets), all indexed by
+    branch_index: union is a BranchSet, hit_matrix the (runs, branches) uint32
+    hit counts, hit_frequency the number of runs that hit each branch and
+    run_bitsets the per-run bitsets, which also answer "which runs hit branch X".
+    """
+    hit_matrix = build_hit_matrix(coverage_files, branch_index)
+    frequency = hit_frequency(hit_matrix)
+    run_bitsets = RunBitsets(hit_matrix, [run_num for run_num, _ in coverage_files], branch_index)
+    
+    # Only branches with hit_count > 0 in at least one run are part of the union
+    return run_bitsets.union(), hit_matrix, frequency, run_bitsets
+
+def parse_fault_auc_file(file_path):
+    """
+    Parse fault-auc.txt file to extract the fault discovery score.
+    Returns the final score (float) or None if parsing fails.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            content = f.read()
+        
+        # Look for the final score line
+        score_match = re.search(r"Your Test Suite's Discovery Score:\s*([0-9\.]+)", content)
+        if score_match:
+            return float(score_match.group(1))
+        
+        # Fallback: look for the calculation line
+        calc_match = re.search(r"Final Score = .+ = ([0-9\.]+)", content)
+        if calc_match:
+            return float(calc_match.group(1))
+            
+        return None
+    except Exception as e:
+        print(f"⚠️  Error parsing fault AUC file {file_path}: {e}")
+        return None
+
+def parse_results_auc_file(file_path):
+    """
+    Parse results-auc.txt file to extract branch coverage AUC and final coverage.
+    Returns tuple (final_coverage, auc_value) or (None, None) if parsing fails.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            content = f.read()
+        
+        # Extract final branch coverage
+        coverage_match = re.search(r"Final Branch Coverage:\s*([0-9\.]+)%", content)
+        final_coverage = float(coverage_match.group(1)) if coverage_match else None
+        
+        # Extract AUC value
+        auc_match = re.search(r"AUC \(Branch Coverage vs\. Time\):\s*([0-9\.]+)", content)
+        auc_value = float(auc_match.group(1)) if auc_match else None
+        
+        return final_coverage, auc_value
+    except Exception as e:
+        print(f"⚠️  Error parsing results AUC file {file_path}: {e}")
+        return None, None
+
+def new_auc_data():
+    """
+    Empty AUC data dict: per-metric value lists (kept for the rank tests), the
+    run each value came from ('value_runs') and an OnlineSummary per metric that
+    is updated as each run is read.
+    """
+    return {
+        'fault_scores': [],
+        'branch_coverage_final': [],
+        'branch_coverage_auc': [],
+        'run_numbers': [],
+        'fault_score_mismatches': [],
+        'value_runs': {key: [] for key in AUC_METRICS},
+        'summaries': {key: OnlineSummary() for key in AUC_METRICS}
+    }
+
+def add_auc_value(auc_data, key, value, run_num):
+    auc_data[key].append(value)
+    auc_data['value_runs'][key].append(run_num)
+    auc_data['summaries'][key].update(value)
+
+def load_fault_scores(runs):
+    """
+    Fault discovery scores of a list of RunEntries. Scores are computed from every
+    run's fault_discovery_rate.csv in one vectorized pass and cross-checked
+    against the score printed in fault-auc.txt; runs without a usable CSV fall
+    back to the text score.
+    Returns ([(run_num, score)] in run order, [(run_num, csv_score, text_score)] mismatches).
+    """
+    curves = {}
+    for run in runs:
+        if FAULT_CSV in run.files:
+            curve = read_discovery_curve(run.run_dir / FAULT_CSV)
+            if curve is not None:
+                curves[run.run_num] = curve
+    csv_scores = {
+        run_num: float(score)
+        for run_num, score in zip(curves, fault_auc_scores(list(curves.values())))
+        if not math.isnan(score)
+    }
+
+    text_scores = {}
+    for run in runs:
+        if "fault-auc.txt" in run.files:
+            text_score = parse_fault_auc_file(run.run_dir / "fault-auc.txt")
+            if text_score is not None:
+                text_scores[run.run_num] = text_score
+
+    mismatches = find_mismatches(csv_scores, text_scores)
+    run_dirs = {run.run_num: run.run_dir for run in runs}
+    for run_num, csv_score, text_score in mismatches:
+        print(f"⚠️  {run_dirs[run_num]}: fault score {csv_score:.4f} from {FAULT_CSV} "
+              f"does not match fault-auc.txt ({text_score:.4f})")
+
+    scores = []
+    for run in runs:
+        score = csv_scores.get(run.run_num, text_scores.get(run.run_num))
+        if score is not None:
+            scores.append((run.run_num, score))
+    return scores, mismatches
+
+def load_auc_data(manifest):
+    """
+    Load AUC data for the runs in a tool's RunManifest: fault scores from
+    fault_discovery_rate.csv (checked against fault-auc.txt, see load_fault_scores)
+    and coverage values from results-auc.txt.
+    Returns dict with run data.
+    """
+    auc_data = new_auc_data()
+    
+    fault_scores, auc_data['fault_score_mismatches'] = load_fault_scores(manifest.runs)
+    for run_num, fault_score in fault_scores:
+        add_auc_value(auc_data, 'fault_scores', fault_score, run_num)
+        auc_data['run_numbers'].append(run_num)
+    
+    # Parse results-auc.txt
+    results_files, _ = manifest.run_files("results-auc.txt")
+    for run_num, results_file in results_files:
+        final_cov, auc_val = parse_results_auc_file(results_file)
+        if final_cov is not None:
+            add_auc_value(auc_data, 'branch_coverage_final', final_cov, run_num)
+        if auc_val is not None:
+            add_auc_value(auc_data, 'branch_coverage_auc', auc_val, run_num)
+    
+    print(f"📊 {manifest.tool.capitalize()} AUC data: {len(auc_data['fault_scores'])} fault scores, {len(auc_data['branch_coverage_auc'])} coverage AUCs")
+    return auc_data
+
+def read_run_results(run):
+    """
+    Per-run AUC values of one RunEntry: (fault_score, final_coverage, coverage_auc),
+    with None for anything missing.
+    """
+    final_cov = auc_val = None
+    fault_scores, _ = load_fault_scores([run])
+    fault_score = fault_scores[0][1] if fault_scores else None
+    if "results-auc.txt" in run.files:
+        final_cov, auc_val = parse_results_auc_file(run.run_dir / "results-auc.txt")
+    return fault_score, final_cov, auc_val
+
+# --- NEW FUNCTIONS FOR UNIQUE FAULT ANALYSIS ---
+
+def normalize_fault_line(line, fault_rules):
+    """
+    Removes transient parts of a fault string (as described by an app profile's
+    fault_rules, e.g. timestamps or JS line/col numbers) to group similar faults.
+    The rules are compiled once per rule list and results are memoized.
+    """
+    return get_normalizer(fault_rules).normalize(line)
+
+def read_fault_lines(file_path):
+    """
+    Read the raw (not yet normalized) fault lines of a unique_faults.txt file.
+    """
+    lines = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                # Exclude header/footer and empty lines
+                if line and not line.startswith("---"):
+                    lines.append(line)
+    except Exception as e:
+        print(f"⚠️  Error parsing unique faults file {file_path}: {e}")
+    return lines
+
+def parse_unique_faults_file(file_path, fault_rules):
+    """
+    Parse a unique_faults.txt file and return a set of NORMALIZED fault strings.
+    """
+    return get_normalizer(fault_rules).normalize_all(read_fault_lines(file_path))
+
+def load_all_unique_faults(manifest, fault_rules):
+    """
+    Load and aggregate all unique faults for a given tool across all runs in its RunManifest.
+    Returns (aggregated_faults, {run_num: set of the run's faults}).
+    """
+    aggregated_faults = set()
+    run_faults = {}
+    
+    fault_files, missing = manifest.run_files("unique_faults.txt")
+    for run_num, fault_file in fault_files:
+        run_faults[run_num] = parse_unique_faults_file(fault_file, fault_rules)
+        aggregated_faults.update(run_faults[run_num])
+    for fault_file in missing:
+        print(f"⚠️  Missing unique faults file: {fault_file}")
+            
+    print(f"🐞 {manifest.tool.capitalize()} unique faults: Found {len(aggregated_faults)} unique fault types across all runs.")
+    return aggregated_faults, run_faults
+
+# --- END OF NEW FUNCTIONS ---
+
+# --- MODIFIED FUNCTION ---
+def calculate_auc_statistics(data):
+    """
+    Calculate mean, median, std dev, IQR, min, max for a list of values or an
+    OnlineSummary that was updated while the runs were ingested.
+    """
+    summary = data if isinstance(data, OnlineSummary) else OnlineSummary.from_values(data)
+    if summary.count == 0:
+        return {'mean': 0, 'median': 0, 'std': 0, 'iqr': 0, 'min': 0, 'max': 0, 'count': 0}
+    
+    stats_dict = {
+        'mean': summary.mean,
+        'median': summary.median,
+        'min': summary.min,
+        'max': summary.max,
+        'count': summary.count,
+        'std': summary.std,
+        'iqr': 0
+    }
+    
+    # IQR requires at least two points to calculate quantiles
+    if summary.count > 1:
+        quartiles = summary.quantiles(n=4)
+        stats_dict['iqr'] = quartiles[2] - quartiles[0]
+    
+    return stats_dict
+
+def format_branch_info(branch_key, location_index):
+    """
+    Format branch information for display.
+    location_index is the {branch_key: (line, column, branch_type, function_name)}
+    dict built once by build_location_index.
+    """
+    file_path, branch_id, path_index = branch_key
+    
+    location = location_index.get(branch_key)
+    if location is None:
+        location_info = "Unknown location"
+    else:
+        line, column, branch_type, function_name = location
+        location_info = f"Line {line}, Col {column}"
+        if branch_type:
+            location_info += f" ({branch_type}"
+            location_info += f" in `{function_name}`)" if function_name else ")"
+    
+    return f"📂 {file_path} - Branch #{branch_id} (path {path_index}) at {location_info}"
+    
+
+def extract_test_features(test_file):
+    """
+    Extract the test-pattern features of one generated test suite:
+    {'length': number of method calls, 'methods': {method: count}, 'parameters': {params: count}}.
+    Counts are kept in first-seen order. Raises OSError if the file cannot be read.
+    """
+    with open(test_file, 'r') as f:
+        content = f.read()
+    
+    # Extract method calls
+    method_calls = re.findall(r'classUnderTestApogen0\.(\w+)\(([^)]*)\)', content)
+    features = {'length': len(method_calls), 'methods': {}, 'parameters': {}}
+    
+    for method, params in method_calls:
+        features['methods'][method] = features['methods'].get(method, 0) + 1
+        if params.strip():
+            features['parameters'][params.strip()] = features['parameters'].get(params.strip(), 0) + 1
+    return features
+
+def load_run_test_features(run):
+    """[(suite_index, features)] for the test suites of one RunEntry that have a test file."""
+    run_features = []
+    for suite in run.suites:
+        test_file = suite.suite_dir / "main" / "ClassUnderTestApogen_ESTest.java"
+        if os.path.exists(test_file):
+            try:
+                run_features.append((suite.index, extract_test_features(test_file)))
+            except Exception as e:
+                print(f"⚠️  Could not analyze test file for run {run.run_num}: {e}")
+    return run_features
+
+def load_test_features(manifest):
+    """{run_number: [features of each test suite]} for every run in a tool's RunManifest."""
+    test_features = {}
+    for run in manifest.runs:
+        run_features = load_run_test_features(run)
+        if run_features:
+            test_features[run.run_num] = [features for _, features in run_features]
+    return test_features
+
+def analyze_test_patterns(run_numbers, test_features):
+    """Analyze patterns in test suites for given runs, from their extracted test features."""
+    patterns = {
+        'method_calls': defaultdict(int),
+        'parameters': defaultdict(int),
+        'test_lengths': []
+    }
+    
+    for run in run_numbers:
+        for features in test_features.get(run, []):
+            patterns['test_lengths'].append(features['length'])
+            for method, count in features['methods'].items():
+                patterns['method_calls'][method] += count
+            for params, count in features['parameters'].items():
+                patterns['parameters'][params] += count
+
+    return patterns
+
+
+def copy_relevant_test_files(only_in_enhanced, enhanced_run_bitsets, enhanced_manifest):
+    """Copy test files for manual inspection, grouped by branch."""
+    import shutil
+    
+    # Create main output directory
+    output_dir = Path("test_files_for_inspection")
+    output_dir.mkdir(exist_ok=True)
+    
+    print(f"\n📁 Copying test files to {output_dir}/ for manual inspection...")
+    
+    copied_files = []
+    for branch in sorted(only_in_enhanced):
+        file_path, branch_id, path_index = branch
+        
+        # Create branch-specific folder
+        clean_filename = file_path.replace('/', '_').replace('.js', '')
+        branch_folder = output_dir / f"branch{branch_id}path{path_index}_{clean_filename}"
+        branch_folder.mkdir(exist_ok=True)
+        
+        # Find which runs hit this branch
+        hitting_runs = enhanced_run_bitsets.runs_for(branch)
+        
+        # Copy all test files for this branch into its folder
+        run_suites = [(run, suite) for run in hitting_runs for suite in enhanced_manifest.run(run).suites]
+        for run, suite in run_suites:
+            source_file = suite.suite_dir / "main" / "ClassUnderTestApogen_ESTest.java"
+            if os.path.exists(source_file):
+                suffix = "" if suite.index == 0 else f"_suite{suite.index}"
+                dest_file = branch_folder / f"run{run}{suffix}_test.java"
+                
+                try:
+                    shutil.copy2(source_file, dest_file)
+                    copied_files.append(dest_file)
+                except Exception as e:
+                    print(f"⚠️  Could not copy {source_file}: {e}")
+    
+    print(f"✅ Copied {len(copied_files)} test files to {output_dir}/")
+    return output_dir
+
+# --- NEW FUNCTION FOR STATISTICAL ANALYSIS (BUG FIXED) ---
+def run_and_format_stat_tests(baseline_data, enhanced_data):
+    """
+    Runs Mann-Whitney U and calculates A12 effect size for all metrics,
+    and returns a formatted Markdown table.
+    All metrics are tested in one vectorized call, each with its own sample sizes.
+    A12 = U1 / (n1 * n2) is the probability that Enhanced scores higher than Baseline.
+    """
+    if not all(k in baseline_data and k in enhanced_data for k in ['fault_scores', 'branch_coverage_auc', 'branch_coverage_final']):
+        return "## 🔬 Statistical Significance Analysis\n\n- Data missing for statistical analysis.\n"
+    
+    metrics = STAT_METRICS
+    mwu = mann_whitney_u(
+        [enhanced_data[key] for key, _, _, _ in metrics],
+        [baseline_data[key] for key, _, _, _ in metrics],
+        alternative=[alternative for _, _, alternative, _ in metrics]
+    )
+    results = [
+        {'Metric': label, 'p-value': p_value, 'A12': a12, 'Interpretation': interpretation}
+        for (_, label, _, interpretation), p_value, a12 in zip(metrics, mwu.p_value, mwu.a12)
+    ]
+    
+    # Format the table
+    report = "## 🔬 Statistical Significance Analysis\n\n"
+    report += "| Metric | p-value | A₁₂ (Enhanced vs. Baseline) | Conclusion |\n"
+    report += "|:---|:---:|:---:|:---|\n"
+    
+    for res in results:
+        if math.isnan(res['p-value']):
+            report += f"| **{res['Metric']}** | n/a | n/a | Not enough data |\n"
+            continue
+        p_str = f"**{res['p-value']:.3f}**" if res['p-value'] < 0.05 else f"{res['p-value']:.3f}"
+        
+        a12 = res['A12']
+        effect_size = ""
+        # Effect size thresholds for A12
+        if a12 > 0.71 or a12 < 0.29: effect_size = "large"
+        elif a12 > 0.64 or a12 < 0.36: effect_size = "medium"
+        elif a12 > 0.56 or a12 < 0.44: effect_size = "small"
+        else: effect_size = "negligible"
+        
+        conclusion = "Not Statistically Significant"
+        if res['p-value'] < 0.05:
+            advantage = "Enhanced" if a12 > 0.5 else "Baseline"
+            conclusion = f"**Significant**, with a **{effect_size}** effect size in favor of **{advantage}**."
+        elif effect_size != "negligible":
+             conclusion = f"Not significant, but a **{effect_size} effect size** trend was observed."
+
+
+        report += f"| **{res['Metric']}** | {p_str} | {a12:.3f} | {conclusion} |\n"
+        
+    report += "\n*The **p-value** indicates statistical significance (p < 0.05 is significant).*\n"
+    report += "*The **A₁₂ effect size** measures the probability that a random run from 'Enhanced' will outperform a random run from 'Baseline'. 0.5 is no difference, >0.5 favors Enhanced.*\n"
+
+    return report
+
+
+def is_run_complete(run, app):
+    """True once one of the run's test suites contains the app's complete marker file."""
+    marker = APP_PROFILES[app]['complete_marker'].format(app=app)
+    return any(marker in suite.files for suite in run.suites)
+
+
+def format_bootstrap_intervals(baseline_data, enhanced_data, resamples=DEFAULT_RESAMPLES,
+                               confidence=DEFAULT_CONFIDENCE, seed=0, jobs=1):
+    """
+    Bootstrap confidence intervals (resampling runs) for the mean and median of
+    every AUC/coverage metric, their Enhanced - Baseline difference and A12,
+    as a formatted Markdown table.
+    """
+    # (metric key, label, number format, unit)
+    metrics = [
+        ('fault_scores', 'Fault Discovery Score', '.4f', ''),
+        ('branch_coverage_auc', 'Branch Coverage Growth (AUC)', '.2f', ''),
+        ('branch_coverage_final', 'Final Branch Coverage', '.2f', '%'),
+    ]
+    intervals = bootstrap_metrics(
+        {key: (baseline_data.get(key, []), enhanced_data.get(key, [])) for key, _, _, _ in metrics},
+        resamples=resamples, confidence=confidence, seed=seed, jobs=jobs
+    )
+
+    report = "## 📏 Bootstrap Confidence Intervals\n\n"
+    report += f"*{confidence:.0%} percentile intervals from {resamples} resamples of the runs (seed {seed}).*\n\n"
+    report += "| Metric | Statistic | Baseline | Enhanced | Difference (Enhanced - Baseline) |\n"
+    report += "|:---|:---|:---:|:---:|:---:|\n"
+    for key, label, fmt, unit in metrics:
+        if key not in intervals:
+            report += f"| **{label}** | - | n/a | n/a | n/a |\n"
+            continue
+        ci = intervals[key]
+        for statistic in ('mean', 'median'):
+            cells = [
+                f"[{low:{fmt}}{unit}, {high:{fmt}}{unit}]"
+                for low, high in (ci['baseline'][statistic], ci['enhanced'][statistic], ci['difference'][statistic])
+            ]
+            report += f"| **{label}** | {statistic.capitalize()} | {' | '.join(cells)} |\n"
+        low, high = ci['a12']
+        report += f"| **{label}** | A₁₂ | - | - | [{low:.3f}, {high:.3f}] |\n"
+    return report
+
+
+def format_branch_tests(branch_index, location_index, baseline_freq, baseline_runs, enhanced_freq, enhanced_runs,
+                        shared_mask, fdr=0.05, grid=None):
+    """
+    Per-branch hit-rate comparison as Markdown: a two-sided Fisher exact test for
+    every branch hit by either tool with Benjamini-Hochberg correction, and the
+    "more consistent" bucket counts of shared branches for a grid of
+    (high, low) thresholds (default_threshold_grid of the smaller run count).
+    """
+    tests = compare_branch_hit_rates(enhanced_freq, enhanced_runs, baseline_freq, baseline_runs, fdr=fdr)
+    tested = int(np.count_nonzero(~np.isnan(tests['p_value'])))
+    highs, lows = grid or default_threshold_grid(min(baseline_runs, enhanced_runs))
+    sweep = sweep_consistency_thresholds(enhanced_freq, enhanced_runs, baseline_freq, baseline_runs,
+                                         highs, lows, mask=shared_mask)
+
+    report = "## 🧪 Per-Branch Hit-Rate Tests\n\n"
+    report += (f"*Two-sided Fisher's exact test of the hit rate of each of the {tested} branches hit by either tool, "
+               f"Benjamini-Hochberg FDR q ≤ {fdr}.*\n\n")
+    report += f"- **Hit significantly more often by Enhanced:** {int(tests['higher_in_1'].sum())}\n"
+    report += f"- **Hit significantly more often by Baseline:** {int(tests['higher_in_2'].sum())}\n\n"
+
+    significant = np.flatnonzero(tests['significant'])
+    if len(significant):
+        report += "| Branch | Enhanced | Baseline | p-value | q-value |\n"
+        report += "|:---|:---:|:---:|:---:|:---:|\n"
+        for i in sorted(significant, key=lambda i: (tests['q_value'][i], branch_index.keys[i])):
+            report += (f"| {format_branch_info(branch_index.keys[i], location_index)} "
+                       f"| {enhanced_freq[i]}/{enhanced_runs} | {baseline_freq[i]}/{baseline_runs} "
+                       f"| {tests['p_value'][i]:.2e} | {tests['q_value'][i]:.2e} |\n")
+        report += "\n"
+    else:
+        report += "*No branch differs significantly.*\n\n"
+
+    report += "### Consistency Threshold Sweep (shared branches)\n\n"
+    report += "*Cells: Enhanced hits in ≥ high runs while Baseline hits in < low runs / the reverse.*\n\n"
+    report += "| High \\ Low | " + " | ".join(f"< {low}" for low in lows) + " |\n"
+    report += "|:---|" + ":---:|" * len(lows) + "\n"
+    for high in highs:
+        cells = [f"{sweep[high, low][0]} / {sweep[high, low][1]}" for low in lows]
+        report += f"| ≥ {high} | " + " | ".join(cells) + " |\n"
+    return report
+
+
+def format_saturation_curves(baseline, enhanced, baseline_run_bitsets, enhanced_run_bitsets,
+                             orderings=DEFAULT_ORDERINGS, confidence=DEFAULT_CONFIDENCE, seed=0):
+    """
+    Saturation curves as Markdown: the expected number of distinct branches and
+    fault types found by k runs (exact rarefaction expectation), with a
+    confidence band over `orderings` random run orderings, for both tools.
+    """
+    curves = {}
+    for role, dataset, run_bitsets in (('baseline', baseline, baseline_run_bitsets),
+                                       ('enhanced', enhanced, enhanced_run_bitsets)):
+        curves[role, 'branches'] = rarefaction_curve(run_bitsets.bits, orderings, confidence, seed)
+        curves[role, 'faults'] = rarefaction_curve(pack_sets(_faults_in_run_order(dataset)), orderings, confidence, seed)
+
+    report = "## 📈 Saturation Curves\n\n"
+    report += (f"*Expected distinct branches / fault types found by k runs, with {confidence:.0%} bands "
+               f"over {orderings} random run orderings (seed {seed}).*\n\n")
+    for item, label in (('branches', 'Branches'), ('faults', 'Fault Types')):
+        baseline_curve, enhanced_curve = curves['baseline', item], curves['enhanced', item]
+        report += f"### {label}\n\n"
+        report += "| Runs | Baseline | Enhanced |\n"
+        report += "|:---:|:---:|:---:|\n"
+        for k in curve_points(max(len(baseline_curve.runs), len(enhanced_curve.runs))):
+            cells = []
+            for curve in (baseline_curve, enhanced_curve):
+                if k > len(curve.runs):
+                    cells.append("-")
+                else:
+                    cells.append(f"{curve.expected[k - 1]:.1f} [{curve.low[k - 1]:.0f}, {curve.high[k - 1]:.0f}]")
+            report += f"| {k} | {' | '.join(cells)} |\n"
+        report += "\n"
+        for fraction in SATURATION_LEVELS:
+            needed = [runs_to_reach(curve, fraction) for curve in (baseline_curve, enhanced_curve)]
+            needed = ["n/a" if k is None else k for k in needed]
+            report += (f"- **Runs for {fraction:.0%} of the final {label.lower()}:** "
+                       f"Baseline {needed[0]}, Enhanced {needed[1]}\n")
+        report += "\n"
+    return report
+
+
+def _values_in_run_order(dataset, key):
+    """A metric's values sorted by the position of their run in the manifest."""
+    position = {run_num: i for i, run_num in enumerate(dataset['manifest'].run_numbers)}
+    pairs = zip(dataset['auc'][key], dataset['auc']['value_runs'][key])
+    return [value for value, run_num in sorted(pairs, key=lambda pair: position.get(pair[1], len(position)))]
+
+
+def _faults_in_run_order(dataset):
+    """Every manifest run's fault set in manifest order; runs without a fault file count as empty."""
+    run_faults = dataset.get('run_faults', {})
+    return [run_faults.get(run_num, set()) for run_num in dataset['manifest'].run_numbers]
+
+
+def format_prefix_stability(baseline, enhanced, baseline_run_bitsets, enhanced_run_bitsets,
+                            min_runs=DEFAULT_MIN_RUNS, plot_file=None):
+    """
+    Prefix stability as Markdown: every metric's means, Mann-Whitney p-value and
+    A12, and the branch/fault unions, using only the first k runs of each tool
+    for k = min_runs..N, plus the prefix from which each conclusion stays
+    the same as with all runs. With plot_file, also writes a PNG of the curves.
+    """
+    last = min(len(baseline_run_bitsets.run_numbers), len(enhanced_run_bitsets.run_numbers))
+    prefixes = prefix_points(min_runs, last)
+    metric_tests = prefix_metric_tests(
+        {key: _values_in_run_order(baseline, key) for key, _, _, _ in STAT_METRICS},
+        {key: _values_in_run_order(enhanced, key) for key, _, _, _ in STAT_METRICS},
+        {key: alternative for key, _, alternative, _ in STAT_METRICS},
+        prefixes
+    )
+    all_faults = sorted(baseline['faults'] | enhanced['faults'])
+    stability = {
+        'prefixes': prefixes,
+        'metrics': metric_tests,
+        'branches': prefix_unions(baseline_run_bitsets.bits, enhanced_run_bitsets.bits, prefixes),
+        'faults': prefix_unions(pack_sets(_faults_in_run_order(baseline), all_faults),
+                                pack_sets(_faults_in_run_order(enhanced), all_faults), prefixes),
+    }
+
+    report = "## 🧭 Prefix Stability\n\n"
+    report += (f"*Each row only uses the first k runs of each tool (k = {prefixes[0]}..{prefixes[-1]}); "
+               f"p-values are one-sided Mann-Whitney U tests as above, A₁₂ is Enhanced vs. Baseline.*\n\n")
+    header = "| Runs |"
+    align = "|:---:|"
+    for _, label, _, _ in STAT_METRICS:
+        header += f" {label} (B / E) | p | A₁₂ |"
+        align += ":---:|:---:|:---:|"
+    header += " Branches (B / E) | Only B / Only E | Fault Types (B / E) |"
+    align += ":---:|:---:|:---:|"
+    report += header + "\n" + align + "\n"
+
+    def pair(values, i, fmt):
+        return " / ".join("-" if np.isnan(value[i]) else f"{value[i]:{fmt}}" for value in values)
+
+    for i, k in enumerate(prefixes):
+        row = f"| {k} |"
+        for key, _, _, _ in STAT_METRICS:
+            tests = metric_tests[key]
+            fmt = '.4f' if key == 'fault_scores' else '.2f'
+            p_value, a12 = tests['p_value'][i], tests['a12'][i]
+            p_str = "n/a" if np.isnan(p_value) else (f"**{p_value:.3f}**" if p_value < SIGNIFICANCE else f"{p_value:.3f}")
+            a12_str = "n/a" if np.isnan(a12) else f"{a12:.3f}"
+            row += f" {pair((tests['baseline_mean'], tests['enhanced_mean']), i, fmt)} | {p_str} | {a12_str} |"
+        branches, faults = stability['branches'], stability['faults']
+        row += f" {pair((branches['baseline'], branches['enhanced']), i, '.0f')} |"
+        row += f" {pair((branches['only_baseline'], branches['only_enhanced']), i, '.0f')} |"
+        row += f" {pair((faults['baseline'], faults['enhanced']), i, '.0f')} |"
+        report += row + "\n"
+    report += "\n"
+
+    for key, label, _, _ in STAT_METRICS:
+        tests = metric_tests[key]
+        conclusions = [conclusion(p, a) for p, a in zip(tests['p_value'], tests['a12'])]
+        if not conclusions:
+            continue
+        final = conclusions[-1]
+        verdict = "no significant difference" if final == "n.s." else f"significant in favor of {final}"
+        report += f"- **{label}:** {verdict} with {prefixes[-1]} runs; unchanged from {stable_from(conclusions, prefixes)} runs on\n"
+
+    if plot_file is not None:
+        labels = {key: label for key, label, _, _ in STAT_METRICS}
+        if plot_prefix_stability(stability, labels, plot_file):
+            report += f"\n📉 **Stability plot:** `{plot_file}`\n"
+        else:
+            print("⚠️  matplotlib is not installed, skipping the prefix stability plot")
+    report += "\n"
+    return report
+
+
+def format_power_analysis(baseline_data, enhanced_data, simulations=DEFAULT_SIMULATIONS, run_counts=None,
+                          target=DEFAULT_TARGET_POWER, seed=0):
+    """
+    Monte-Carlo power analysis as Markdown: for each metric, the probability that
+    a campaign of n runs per tool detects the observed effect (two-sided
+    Mann-Whitney U at the report's significance level, same direction as the
+    observed A12), and the smallest evaluated n reaching the target power.
+    """
+    observed = max(len(baseline_data.get('fault_scores', [])), len(enhanced_data.get('fault_scores', [])))
+    run_counts = sorted(set(run_counts or DEFAULT_RUN_COUNTS) | ({observed} if observed else set()))
+    curves = {
+        key: simulate_power(baseline_data.get(key, []), enhanced_data.get(key, []), run_counts,
+                            simulations=simulations, alpha=SIGNIFICANCE, seed=seed, name=key)
+        for key, _, _, _ in STAT_METRICS
+    }
+
+    report = "## ⚡ Power Analysis\n\n"
+    report += (f"*Probability of detecting the observed difference (α = {SIGNIFICANCE}, two-sided) with n runs per tool, "
+               f"from {simulations} simulated campaigns resampling the observed runs (seed {seed}).*\n\n")
+    report += "| Runs per tool | " + " | ".join(label for _, label, _, _ in STAT_METRICS) + " |\n"
+    report += "|:---:|" + ":---:|" * len(STAT_METRICS) + "\n"
+    for i, runs in enumerate(run_counts):
+        cells = []
+        for key, _, _, _ in STAT_METRICS:
+            power = curves[key].power[i]
+            cells.append("n/a" if np.isnan(power) else (f"**{power:.0%}**" if power >= target else f"{power:.0%}"))
+        marker = " (current)" if runs == observed else ""
+        report += f"| {runs}{marker} | " + " | ".join(cells) + " |\n"
+    report += "\n"
+    for key, label, _, _ in STAT_METRICS:
+        curve = curves[key]
+        if np.isnan(curve.observed_a12):
+            report += f"- **{label}:** not enough data\n"
+            continue
+        needed = runs_needed(curve, target)
+        needed = f"{needed} runs per tool" if needed is not None else f"more than {run_counts[-1]} runs per tool"
+        report += f"- **{label}** (observed A₁₂ = {curve.observed_a12:.3f}): {target:.0%} power needs {needed}\n"
+    report += "\n"
+    return report
+
+
+def parse_run_counts(spec):
+    """Parse a comma-separated list of run counts such as "10,20,40"."""
+    try:
+        counts = [int(value) for value in spec.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid run counts '{spec}', expected e.g. 10,20,40")
+    if any(count < 2 for count in counts):
+        raise argparse.ArgumentTypeError("Run counts must be at least 2")
+    return counts
+
+
+def load_coverage_timelines(manifest):
+    """RunTimelines of the runs in a RunManifest; runs without usable timestamps are skipped."""
+    timelines = []
+    for run in manifest.runs:
+        timeline = load_run_timeline(run)
+        if timeline is None:
+            print(f"⚠️  {run.run_dir}: no coverage-report timestamps in results-auc.txt, left out of the time curves")
+        else:
+            timelines.append(timeline)
+    return timelines
+
+
+def format_coverage_timeline(baseline, enhanced, points=DEFAULT_GRID_POINTS, confidence=DEFAULT_CONFIDENCE, rows=10):
+    """
+    Coverage-vs-time analysis as Markdown. Every run's coverage-report timeline is
+    resampled onto one time grid shared by both tools; the report shows the
+    mean branch coverage with confidence bands of the mean at `rows` + 1 grid
+    times, and per metric the duration-normalized AUC (time-averaged coverage
+    over the run's own duration) and the AUC over the shared horizon.
+    """
+    timelines = {
+        'baseline': load_coverage_timelines(baseline['manifest']),
+        'enhanced': load_coverage_timelines(enhanced['manifest']),
+    }
+    if not timelines['baseline'] or not timelines['enhanced']:
+        return "## ⏱️ Coverage over Time\n\n- No coverage-report timelines found.\n\n"
+    grid = make_grid(timelines['baseline'] + timelines['enhanced'], points)
+    branches = COVERAGE_METRICS.index('Branches')
+
+    results = {}
+    for role, dataset in (('baseline', baseline), ('enhanced', enhanced)):
+        resampled = resample(timelines[role], grid)
+        areas, durations = timeline_areas(timelines[role])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            normalized = np.where(durations[:, None] > 0, areas * 100 / durations[:, None], np.nan)
+        reported = {}
+        for run_num, value in zip(dataset['auc']['value_runs']['branch_coverage_auc'],
+                                  dataset['auc']['branch_coverage_auc']):
+            reported[run_num] = value
+        results[role] = {
+            'bands': timeline_bands(resampled, confidence),
+            'normalized': normalized,
+            'horizon': horizon_normalized_auc(resampled, grid),
+            'durations': durations,
+            'mismatches': area_mismatches(timelines[role], areas, durations, reported),
+        }
+    baseline_result, enhanced_result = results['baseline'], results['enhanced']
+
+    report = "## ⏱️ Coverage over Time\n\n"
+    report += (f"*coverage-report timelines of {len(timelines['baseline'])} Baseline and {len(timelines['enhanced'])} "
+               f"Enhanced runs, resampled onto a shared grid of {points} points over {grid[-1]:.0f}s "
+               f"(final coverage held after a run ends); brackets are {confidence:.0%} confidence intervals of the mean.*\n\n")
+    report += (f"- **Mean run duration:** Baseline {baseline_result['durations'].mean():.0f}s, "
+               f"Enhanced {enhanced_result['durations'].mean():.0f}s\n\n")
+
+    report += "### Branch Coverage over Time\n\n"
+    report += "| Time (s) | Baseline | Enhanced |\n"
+    report += "|:---:|:---:|:---:|\n"
+    for i in sorted({int(round(value)) for value in np.linspace(0, len(grid) - 1, rows + 1)}):
+        cells = []
+        for result in (baseline_result, enhanced_result):
+            mean, low, high, _ = result['bands']
+            cells.append(f"{mean[i, branches]:.2f}% [{low[i, branches]:.2f}, {high[i, branches]:.2f}]")
+        report += f"| {grid[i]:.0f} | {cells[0]} | {cells[1]} |\n"
+    report += "\n"
+
+    report += "### Time-Normalized Coverage AUC\n\n"
+    report += ("*Duration-normalized: area under the run's own curve divided by its duration. "
+               "Shared horizon: area over the whole grid divided by its length. Both are time-averaged "
+               "coverage in %; p-values are two-sided Mann-Whitney U tests.*\n\n")
+    report += "| Metric | Duration-normalized (B / E) | p | A₁₂ | Shared horizon (B / E) | p | A₁₂ |\n"
+    report += "|:---|:---:|:---:|:---:|:---:|:---:|:---:|\n"
+    keys = ('normalized', 'horizon')
+    x_samples = [enhanced_result[key][:, m] for m in range(len(COVERAGE_METRICS)) for key in keys]
+    y_samples = [baseline_result[key][:, m] for m in range(len(COVERAGE_METRICS)) for key in keys]
+    mwu = mann_whitney_u(x_samples, y_samples)
+    for m, metric in enumerate(COVERAGE_METRICS):
+        row = f"| **{metric}** |"
+        for j, key in enumerate(keys):
+            p_value, a12 = mwu.p_value[m * len(keys) + j], mwu.a12[m * len(keys) + j]
+            p_str = "n/a" if np.isnan(p_value) else (f"**{p_value:.3f}**" if p_value < SIGNIFICANCE else f"{p_value:.3f}")
+            a12_str = "n/a" if np.isnan(a12) else f"{a12:.3f}"
+            row += (f" {np.nanmean(baseline_result[key][:, m]):.2f}% / {np.nanmean(enhanced_result[key][:, m]):.2f}% "
+                    f"| {p_str} | {a12_str} |")
+        report += row + "\n"
+    report += "\n"
+
+    for role, result in (("Baseline", baseline_result), ("Enhanced", enhanced_result)):
+        if result['mismatches']:
+            runs = ", ".join(f"run {run_num} ({area:.4f} vs {value:.4f})" for run_num, area, value in result['mismatches'])
+            report += f"⚠️ **{role} AUC cross-check:** recomputed branch AUC differs from results-auc.txt for {runs}\n\n"
+    return report
+
+
+def format_discovery_curves(baseline, enhanced, plot_file=None, bands=DEFAULT_BANDS, title=""):
+    """
+    Fault-discovery curves of all runs as Markdown: per test case, the mean,
+    median and widest quantile band of the cumulative unique faults of each
+    tool. With plot_file, also writes one comparison PNG of both tools (redrawn
+    only when its input CSVs changed).
+    """
+    curves = {
+        "Baseline": load_discovery_curves(baseline['manifest'].runs),
+        "Enhanced": load_discovery_curves(enhanced['manifest'].runs),
+    }
+    width = max(tool_curves.faults.shape[1] for tool_curves in curves.values())
+    curves = {label: widen(tool_curves, width) for label, tool_curves in curves.items()}
+    summaries = {label: discovery_bands(tool_curves, bands) for label, tool_curves in curves.items()}
+    widest = max(bands, key=lambda band: band[1] - band[0])
+
+    report = "## 📈 Fault Discovery Curves\n\n"
+    if not any(summary.runs for summary in summaries.values()):
+        return report + f"- No {FAULT_CSV} files found.\n\n"
+    report += (f"*Cumulative unique faults after each test case over {summaries['Baseline'].runs} Baseline and "
+               f"{summaries['Enhanced'].runs} Enhanced runs; runs that stopped earlier keep their final count. "
+               f"Cells are mean (median) [{widest[0]:.0%}-{widest[1]:.0%} quantiles], "
+               f"Runs is how many runs reached that test case.*\n\n")
+    report += "| Test Case | Baseline | Enhanced | Runs (B / E) |\n"
+    report += "|:---:|:---:|:---:|:---:|\n"
+    for i in range(width):
+        cells, active = [], []
+        for summary in summaries.values():
+            if summary.runs:
+                low, high = summary.bands[widest]
+                cells.append(f"{summary.mean[i]:.2f} ({summary.median[i]:.1f}) [{low[i]:.1f}, {high[i]:.1f}]")
+            else:
+                cells.append("-")
+            active.append(str(int(summary.active[i])))
+        report += f"| {i + 1} | {cells[0]} | {cells[1]} | {' / '.join(active)} |\n"
+    report += "\n"
+
+    if plot_file is not None:
+        status = plot_discovery_curves(curves, plot_file, bands, title)
+        if status is None:
+            report += "⚠️ matplotlib is not installed; no discovery curve figure was written.\n\n"
+        else:
+            print(f"📈 Discovery curve figure {'unchanged' if status == 'cached' else 'written'}: {plot_file}")
+            report += f"📈 **Discovery curve figure:** `{plot_file}`\n\n"
+    return report
+
+
+def _seconds(value):
+    return "-" if value is None or np.isnan(value) else f"{value:.0f}s"
+
+
+def format_browser_logs(baseline, enhanced, fault_rules=(), noise=DEFAULT_LOG_NOISE, jobs=1, top=15):
+    """
+    Browser console log analysis as Markdown, streamed from every run's
+    raw_browser_logs.txt: entries per level, time to the first fault with a
+    histogram, fault entries per minute, and when each fault type first appeared.
+    Times are seconds since the start of the run's test execution; fault
+    entries matching `noise` are not counted as faults.
+    """
+    logs = {
+        'Baseline': load_run_logs(baseline['manifest'], fault_rules, jobs, noise),
+        'Enhanced': load_run_logs(enhanced['manifest'], fault_rules, jobs, noise),
+    }
+    report = "## 🧾 Browser Console Logs\n\n"
+    if not logs['Baseline'] and not logs['Enhanced']:
+        return report + f"- No {LOG_FILE} files found.\n\n"
+    report += (f"*Streamed from {LOG_FILE} of {len(logs['Baseline'])} Baseline and {len(logs['Enhanced'])} Enhanced "
+               f"runs; times are seconds since the start of a run's test execution (from its Maven log). "
+               f"Faults are {'/'.join(FAULT_LEVELS)} entries, grouped with the app's fault normalization rules; "
+               f"infrastructure noise is left out.*\n\n")
+    noise_entries = [sum(run_log.noise for run_log in run_logs) for run_logs in logs.values()]
+    if any(noise_entries):
+        report += (f"- **Log noise ignored:** {noise_entries[0]} Baseline and {noise_entries[1]} Enhanced "
+                   f"{'/'.join(FAULT_LEVELS)} entries matching `{'`, `'.join(noise)}`\n\n")
+
+    report += "### Entries per Level\n\n"
+    report += "| Level | Baseline total | Baseline per run | Enhanced total | Enhanced per run |\n"
+    report += "|:---|:---:|:---:|:---:|:---:|\n"
+    levels = level_order({level for run_logs in logs.values() for run_log in run_logs for level in run_log.level_counts})
+    for level in levels:
+        row = f"| {level} |"
+        for run_logs in logs.values():
+            counts = [run_log.level_counts.get(level, 0) for run_log in run_logs]
+            row += f" {sum(counts)} | {np.mean(counts) if counts else 0:.1f} |"
+        report += row + "\n"
+    report += "\n"
+
+    first_faults = {
+        label: np.array([run_log.first_fault for run_log in run_logs if run_log.first_fault is not None], dtype=float)
+        for label, run_logs in logs.items()
+    }
+    report += "### Time to First Fault\n\n"
+    report += "| Statistic | Baseline | Enhanced |\n"
+    report += "|:---|:---:|:---:|\n"
+    report += (f"| Runs with a fault | {len(first_faults['Baseline'])}/{len(logs['Baseline'])} | "
+               f"{len(first_faults['Enhanced'])}/{len(logs['Enhanced'])} |\n")
+    for name, reduce in (("Mean", np.mean), ("Median", np.median), ("Min", np.min), ("Max", np.max)):
+        cells = [_seconds(reduce(values)) if len(values) else "-" for values in first_faults.values()]
+        report += f"| {name} | {cells[0]} | {cells[1]} |\n"
+    report += "\n"
+    mwu = mann_whitney_u([first_faults['Enhanced']], [first_faults['Baseline']])
+    if not np.isnan(mwu.p_value[0]):
+        p_str = f"**{mwu.p_value[0]:.3f}**" if mwu.p_value[0] < SIGNIFICANCE else f"{mwu.p_value[0]:.3f}"
+        report += (f"- **Mann-Whitney U (two-sided, Enhanced vs Baseline):** p = {p_str}, "
+                   f"A₁₂ = {mwu.a12[0]:.3f} (below 0.5: Enhanced hits its first fault sooner)\n\n")
+
+    combined = np.concatenate(list(first_faults.values()))
+    if len(combined):
+        low, high = np.floor(combined.min()), np.ceil(combined.max())
+        edges = np.histogram_bin_edges(combined, bins=min(10, len(np.unique(combined))), range=(low, max(high, low + 1)))
+        histograms = {label: np.histogram(values, bins=edges)[0] for label, values in first_faults.items()}
+        report += "| Time to first fault | Baseline runs | Enhanced runs |\n"
+        report += "|:---:|:---:|:---:|\n"
+        for i in range(len(edges) - 1):
+            report += (f"| {edges[i]:.0f}-{edges[i + 1]:.0f}s | {histograms['Baseline'][i]} | "
+                       f"{histograms['Enhanced'][i]} |\n")
+        report += "\n"
+
+    for level in FAULT_LEVELS:
+        histograms = {label: level_histogram(run_logs, level) for label, run_logs in logs.items()}
+        minutes = max(len(histogram) for histogram in histograms.values())
+        if minutes == 0:
+            continue
+        report += f"### {level} Entries per Minute (mean per run)\n\n"
+        report += "| Minute | Baseline | Enhanced |\n"
+        report += "|:---:|:---:|:---:|\n"
+        for minute in range(minutes):
+            cells = [f"{histogram[minute]:.2f}" if minute < len(histogram) else "0.00" for histogram in histograms.values()]
+            report += f"| {minute}-{minute + 1} | {cells[0]} | {cells[1]} |\n"
+        report += "\n"
+
+    first_seen = {label: defaultdict(list) for label in logs}
+    entries = {label: Counter() for label in logs}
+    for label, run_logs in logs.items():
+        for run_log in run_logs:
+            for key, seconds in run_log.fault_first_seen.items():
+                if seconds is not None:
+                    first_seen[label][key].append(seconds)
+            entries[label].update(run_log.fault_counts)
+    keys = set(first_seen['Baseline']) | set(first_seen['Enhanced'])
+    if keys:
+        ranked = sorted(keys, key=lambda key: (-(len(first_seen['Baseline'].get(key, [])) +
+                                                 len(first_seen['Enhanced'].get(key, []))), key))
+        report += "### Fault Timeline\n\n"
+        report += (f"*When each fault type first appeared in a run (median over the runs that hit it)"
+                   f"{f'; the {top} most frequent of {len(keys)} fault types' if len(keys) > top else ''}.*\n\n")
+        report += "| Fault | Runs (B / E) | Median first seen (B / E) | Entries (B / E) |\n"
+        report += "|:---|:---:|:---:|:---:|\n"
+        for key in ranked[:top]:
+            b, e = first_seen['Baseline'].get(key, []), first_seen['Enhanced'].get(key, [])
+            b_time = _seconds(float(np.median(b))) if b else "-"
+            e_time = _seconds(float(np.median(e))) if e else "-"
+            fault = key.replace("\n", " ").replace("|", "\\|")
+            if len(fault) > 120:
+                fault = fault[:117] + "..."
+            report += (f"| `{fault}` | {len(b)} / {len(e)} | {b_time} / {e_time} | "
+                       f"{entries['Baseline'][key]} / {entries['Enhanced'][key]} |\n")
+        report += "\n"
+    return report
+
+
+def parse_threshold_grid(spec):
+    """Parse a "HIGHS:LOWS" threshold grid such as "10,15,20:1,5" into two int lists."""
+    try:
+        highs, lows = spec.split(":")
+        return [int(v) for v in highs.split(",")], [int(v) for v in lows.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid threshold grid '{spec}', expected e.g. 10,15,20:1,5")
+
+
+def _load_dataset(base_dir, app, tool, cache=None, max_runs=None, results=None, complete_only=False):
+    """
+    Worker for DatasetStore.preload: load one app/tool dataset in a separate process.
+    Coverage files are decoded serially inside the worker.
+    """
+    store = DatasetStore(base_dir, jobs=1, cache=cache, max_runs=max_runs, results=results,
+                         complete_only=complete_only)
+    try:
+        return (app, tool), store._load(app, tool)
+    finally:
+        if results is not None:
+            results.close()
+
+
+class DatasetStore:
+    """
+    Loads each (app, tool) dataset at most once per process: its RunManifest,
+    coverage runs, AUC data and unique faults. Comparisons of several apps (or
+    several comparisons of the same app) share the loaded datasets.
+    max_runs, when given, overrides the app profiles' run limit. With a
+    ResultsStore, only new or changed runs are parsed; the dataset is then read
+    back from the store. complete_only skips runs that are still in progress
+    (no complete marker yet).
+    """
+
+    def __init__(self, base_dir=".", jobs=1, cache=None, max_runs=None, results=None, complete_only=False):
+        self.base_dir = base_dir
+        self.jobs = jobs
+        self.cache = cache
+        self.max_runs = max_runs
+        self.results = results
+        self.complete_only = complete_only
+        self.datasets = {}
+
+    def get(self, app, tool):
+        """Return the dataset dict for app/tool, or None if its results cannot be found."""
+        key = (app, tool)
+        if key not in self.datasets:
+            self.datasets[key] = self._load(app, tool)
+        return self.datasets[key]
+
+    def preload(self, keys, workers=1):
+        """
+        Load every (app, tool) in keys that is not loaded yet, one dataset per
+        worker process. Layouts coming back from the workers are re-interned so
+        runs of the same build still share a single layout in this process.
+        """
+        pending = [key for key in dict.fromkeys(keys) if key not in self.datasets]
+        if workers <= 1 or len(pending) <= 1:
+            for app, tool in pending:
+                self.get(app, tool)
+            return
+
+        apps = [app for app, _ in pending]
+        tools = [tool for _, tool in pending]
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            loaded = executor.map(_load_dataset, repeat(self.base_dir), apps, tools,
+                                  repeat(self.cache), repeat(self.max_runs), repeat(self.results),
+                                  repeat(self.complete_only))
+            for key, dataset in loaded:
+                if dataset is not None:
+                    for _, run_coverage in dataset['coverage_files']:
+                        run_coverage['layout'] = shared_layout(run_coverage['layout'])
+                self.datasets[key] = dataset
+
+    def invalidate(self, app, tool):
+        """Forget a loaded dataset so the next get() picks up new runs."""
+        self.datasets.pop((app, tool), None)
+
+    def scan(self, app, tool):
+        """RunManifest of the runs this store would load for app/tool, or None."""
+        profile = APP_PROFILES[app]
+        max_runs = self.max_runs if self.max_runs is not None else profile['max_runs']
+        manifest = scan_tool_runs(self.base_dir, app, tool, profile['tool_dir_pattern'],
+                                  profile['suite_pattern'], max_runs)
+        if manifest is not None and self.complete_only:
+            complete = [run for run in manifest.runs if is_run_complete(run, app)]
+            manifest = RunManifest(app, tool, manifest.tool_dir, complete)
+        return manifest
+
+    def _load(self, app, tool):
+        profile = APP_PROFILES[app]
+        manifest = self.scan(app, tool)
+        if manifest is None:
+            print(f"Error: No {app}-{tool}-*-run-cc directory found in {self.base_dir}", file=sys.stderr)
+            return None
+        print(f"   {manifest.tool_dir.name}: {len(manifest)} runs")
+
+        if self.results is not None:
+            return self._load_from_results(app, tool, manifest, profile)
+
+        coverage_files = load_all_coverage_files(manifest, jobs=self.jobs, cache=self.cache)
+        if self.cache is not None:
+            self.cache.prune()
+        faults, run_faults = load_all_unique_faults(manifest, profile['fault_rules'])
+        return {
+            'app': app,
+            'tool': tool,
+            'manifest': manifest,
+            'coverage_files': coverage_files,
+            'auc': load_auc_data(manifest),
+            'faults': faults,
+            'run_faults': run_faults,
+            'test_features': load_test_features(manifest),
+        }
+
+    def _ingest(self, app, tool, manifest):
+        """
+        Bring the results store up to date with the runs in manifest: runs that
+        are new or whose files changed are parsed and (re-)ingested, runs that
+        disappeared are dropped. Returns the number of runs ingested.
+        """
+        results = self.results
+        stored = results.ingested_runs(app, tool)
+        signatures = {run.run_num: run_signature(run) for run in manifest.runs}
+
+        for run_num in stored:
+            # Runs left out by max_runs stay stored; only deleted run directories are dropped.
+            if run_num not in signatures and not (manifest.tool_dir / str(run_num)).is_dir():
+                results.remove_run(app, tool, run_num)
+
+        new_runs = [run for run in manifest.runs if stored.get(run.run_num) != signatures[run.run_num]]
+        if not new_runs:
+            results.commit()
+            return 0
+
+        new_manifest = RunManifest(app, tool, manifest.tool_dir, new_runs)
+        coverage = dict(load_all_coverage_files(new_manifest, jobs=self.jobs, cache=self.cache))
+        if self.cache is not None:
+            self.cache.prune()
+
+        for run in new_runs:
+            fault_lines = read_fault_lines(run.run_dir / "unique_faults.txt") if "unique_faults.txt" in run.files else []
+            results.ingest_run(app, tool, run.run_num, run.run_dir, signatures[run.run_num],
+                               coverage.get(run.run_num), *read_run_results(run),
+                               fault_lines, load_run_test_features(run))
+        results.commit()
+        return len(new_runs)
+
+    def _load_from_results(self, app, tool, manifest, profile):
+        """Ingest what changed, then read the whole dataset back from the results store."""
+        ingested = self._ingest(app, tool, manifest)
+        print(f"🗄️  {tool.capitalize()}: ingested {ingested} new or changed runs, "
+              f"{len(manifest) - ingested} already in {self.results.path}")
+
+        run_nums = manifest.run_numbers
+        coverage_files = self.results.load_coverage_files(app, tool, run_nums)
+        for run_num, _ in coverage_files:
+            print(f"✅ Loaded {tool} run {run_num}")
+
+        auc_data = self.results.load_auc_data(app, tool, run_nums, new_auc_data(), add_auc_value)
+        print(f"📊 {tool.capitalize()} AUC data: {len(auc_data['fault_scores'])} fault scores, {len(auc_data['branch_coverage_auc'])} coverage AUCs")
+
+        faults = set()
+        run_faults = {}
+        for run_num, lines in self.results.load_fault_lines(app, tool, run_nums).items():
+            run_faults[run_num] = get_normalizer(profile['fault_rules']).normalize_all(lines)
+            faults.update(run_faults[run_num])
+        print(f"🐞 {tool.capitalize()} unique faults: Found {len(faults)} unique fault types across all runs.")
+
+        return {
+            'app': app,
+            'tool': tool,
+            'manifest': manifest,
+            'coverage_files': coverage_files,
+            'auc': auc_data,
+            'faults': faults,
+            'run_faults': run_faults,
+            'test_features': self.results.load_test_features(app, tool, run_nums),
+        }
+
+
+def analyze_coverage_comparison(app, store, baseline_tool="baseline", enhanced_tool="enhanced",
+                                summary_only=False, with_stats=True, bootstrap=None, branch_tests=None,
+                                saturation=None, prefix_stability=None, power=None, coverage_timeline=None,
+                                discovery_curves=None, browser_logs=None):
+    """
+    Main analysis function comparing baseline vs enhanced coverage AND AUC metrics
+    for one app. Datasets come from a DatasetStore, so they are only loaded once.
+    Any two tools of the app can be compared; baseline_tool takes the "Baseline" role.
+    summary_only prints the console summary without writing a report or copying
+    test files; with_stats=False leaves out the statistical significance section.
+    bootstrap, a dict of bootstrap_metrics keyword arguments (resamples, seed,
+    confidence, jobs), adds bootstrap confidence intervals to the report.
+    branch_tests, a dict of format_branch_tests keyword arguments (fdr, grid),
+    adds per-branch Fisher tests and a consistency threshold sweep.
+    saturation, a dict of format_saturation_curves keyword arguments (orderings,
+    confidence, seed), adds branch and fault saturation curves.
+    prefix_stability, a dict of format_prefix_stability keyword arguments
+    (min_runs, plot), adds the prefix stability table (and plot).
+    power, a dict of format_power_analysis keyword arguments (simulations,
+    run_counts, target, seed), adds a Monte-Carlo power analysis.
+    coverage_timeline, a dict of format_coverage_timeline keyword arguments
+    (points, confidence), adds coverage-vs-time curves and normalized AUCs.
+    discovery_curves, a dict with 'plot', adds the aggregated fault-discovery
+    curves (and their comparison figure).
+    browser_logs, a dict of format_browser_logs keyword arguments (jobs), adds
+    the browser console log analysis.
+    Returns a summary dict of the headline numbers (see write_batch_summary), or
+    None if the data could not be loaded.
+    """
+    profile = APP_PROFILES[app]
+
+    print(f"🔍 Discovering and loading {profile['title']} runs...")
+    print("="*80)
+    baseline = store.get(app, baseline_tool)
+    enhanced = store.get(app, enhanced_tool)
+    if baseline is None or enhanced is None or not baseline['coverage_files'] or not enhanced['coverage_files']:
+        print("❌ Could not load coverage files. Please check directory structure.")
+        return None
+    print("="*80)
+
+    baseline_manifest, enhanced_manifest = baseline['manifest'], enhanced['manifest']
+    baseline_files, enhanced_files = baseline['coverage_files'], enhanced['coverage_files']
+    baseline_auc, enhanced_auc = baseline['auc'], enhanced['auc']
+    baseline_faults, enhanced_faults = baseline['faults'], enhanced['faults']
+
+    print(f"\n📊 Loaded {len(baseline_files)} baseline runs and {len(enhanced_files)} enhanced runs")
+    
+    # Aggregate coverage for each tool
+    print("\n🔄 Aggregating coverage data...")
+    branch_index = BranchIndex.from_runs(baseline_files, enhanced_files)
+    location_index = build_location_index(baseline_files, enhanced_files)
+    baseline_union, baseline_freq, baseline_hit_freq, baseline_run_bitsets = aggregate_tool_coverage(baseline_files, branch_index)
+    enhanced_union, enhanced_freq, enhanced_hit_freq, enhanced_run_bitsets = aggregate_tool_coverage(enhanced_files, branch_index)
+    
+    # Analysis results, including the consistency analysis for shared branches
+    # (hit in at least 10+ runs vs <5 runs)
+    comparison = compare_tools(baseline_union, enhanced_union, baseline_hit_freq, enhanced_hit_freq, high=10, low=5)
+    only_in_enhanced = branch_index.keys_for(comparison['only_in_enhanced'].ids())
+    only_in_baseline = branch_index.keys_for(comparison['only_in_baseline'].ids())
+    shared_branches = comparison['shared']
+    enhanced_more_consistent = [
+        (branch_index.keys[i], int(enhanced_hit_freq[i]), int(baseline_hit_freq[i]))
+        for i in comparison['enhanced_more_consistent'].ids()
+    ]
+    baseline_more_consistent = [
+        (branch_index.keys[i], int(baseline_hit_freq[i]), int(enhanced_hit_freq[i]))
+        for i in comparison['baseline_more_consistent'].ids()
+    ]
+
+    # NEW: Unique Fault analysis
+    faults_only_in_enhanced = enhanced_faults - baseline_faults
+    faults_only_in_baseline = baseline_faults - enhanced_faults
+    shared_faults = baseline_faults & enhanced_faults
+    
+    # Calculate AUC statistics
+    baseline_fault_stats = calculate_auc_statistics(baseline_auc['summaries']['fault_scores'])
+    enhanced_fault_stats = calculate_auc_statistics(enhanced_auc['summaries']['fault_scores'])
+    baseline_cov_auc_stats = calculate_auc_statistics(baseline_auc['summaries']['branch_coverage_auc'])
+    enhanced_cov_auc_stats = calculate_auc_statistics(enhanced_auc['summaries']['branch_coverage_auc'])
+    baseline_final_cov_stats = calculate_auc_statistics(baseline_auc['summaries']['branch_coverage_final'])
+    enhanced_final_cov_stats = calculate_auc_statistics(enhanced_auc['summaries']['branch_coverage_final'])
+
+    if summary_only:
+        report_file = None
+    else:
+        test_files_dir = copy_relevant_test_files(only_in_enhanced, enhanced_run_bitsets, enhanced_manifest)
+
+        # Generate report
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        if (baseline_tool, enhanced_tool) == ("baseline", "enhanced"):
+            report_file = f"{app}_coverage_comparison_report_{timestamp}.md"
+        else:
+            report_file = f"{app}_{baseline_tool}_vs_{enhanced_tool}_coverage_comparison_report_{timestamp}.md"
+    
+        print(f"\n📝 Generating detailed report: {report_file}")
+    
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(f"# {profile['title']} Coverage Comparison Report\n\n")
+            f.write(f"**Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(f"**Baseline runs:** {len(baseline_files)}\n")
+            f.write(f"**Enhanced runs:** {len(enhanced_files)}\n\n")
+            if (baseline_tool, enhanced_tool) != ("baseline", "enhanced"):
+                f.write(f"**Tools compared:** `{baseline_tool}` (Baseline) vs `{enhanced_tool}` (Enhanced)\n\n")
+        
+            # AUC Analysis Section
+            f.write("## 🚀 AUC Performance Analysis\n\n")
+        
+            # --- MODIFIED TABLE SECTION 1 ---
+            # Fault Discovery AUC
+            f.write("### 🎯 Fault Discovery Performance\n\n")
+            f.write("| Metric | Baseline | Enhanced | Difference |\n")
+            f.write("|--------|----------|----------|------------|\n")
+            f.write(f"| Average Score | {baseline_fault_stats['mean']:.4f} | {enhanced_fault_stats['mean']:.4f} | {enhanced_fault_stats['mean'] - baseline_fault_stats['mean']:+.4f} |\n")
+            f.write(f"| Median Score | {baseline_fault_stats['median']:.4f} | {enhanced_fault_stats['median']:.4f} | {enhanced_fault_stats['median'] - baseline_fault_stats['median']:+.4f} |\n")
+            f.write(f"| Std Deviation | {baseline_fault_stats['std']:.4f} | {enhanced_fault_stats['std']:.4f} | {enhanced_fault_stats['std'] - baseline_fault_stats['std']:+.4f} |\n")
+            f.write(f"| IQR | {baseline_fault_stats['iqr']:.4f} | {enhanced_fault_stats['iqr']:.4f} | {enhanced_fault_stats['iqr'] - baseline_fault_stats['iqr']:+.4f} |\n")
+            f.write(f"| Min Score | {baseline_fault_stats['min']:.4f} | {enhanced_fault_stats['min']:.4f} | {enhanced_fault_stats['min'] - baseline_fault_stats['min']:+.4f} |\n")
+            f.write(f"| Max Score | {baseline_fault_stats['max']:.4f} | {enhanced_fault_stats['max']:.4f} | {enhanced_fault_stats['max'] - baseline_fault_stats['max']:+.4f} |\n")
+            f.write(f"| Data Points | {baseline_fault_stats['count']} | {enhanced_fault_stats['count']} | - |\n\n")
+            for role, auc_data in (("Baseline", baseline_auc), ("Enhanced", enhanced_auc)):
+                mismatches = auc_data.get('fault_score_mismatches', [])
+                if mismatches:
+                    runs = ", ".join(f"run {run_num} ({csv_score:.4f} vs {text_score:.4f})"
+                                     for run_num, csv_score, text_score in mismatches)
+                    f.write(f"⚠️ **{role} score cross-check:** {FAULT_CSV} and fault-auc.txt disagree for {runs}; "
+                            f"the CSV scores are used.\n\n")
+        
+            # --- MODIFIED TABLE SECTION 2 ---
+            # Branch Coverage AUC
+            f.write("### 📈 Branch Coverage Growth (AUC)\n\n")
+            f.write("| Metric | Baseline | Enhanced | Difference |\n")
+            f.write("|--------|----------|----------|------------|\n")
+            f.write(f"| Average AUC | {baseline_cov_auc_stats['mean']:.2f} | {enhanced_cov_auc_stats['mean']:.2f} | {enhanced_cov_auc_stats['mean'] - baseline_cov_auc_stats['mean']:+.2f} |\n")
+            f.write(f"| Median AUC | {baseline_cov_auc_stats['median']:.2f} | {enhanced_cov_auc_stats['median']:.2f} | {enhanced_cov_auc_stats['median'] - baseline_cov_auc_stats['median']:+.2f} |\n")
+            f.write(f"| Std Deviation | {baseline_cov_auc_stats['std']:.2f} | {enhanced_cov_auc_stats['std']:.2f} | {enhanced_cov_auc_stats['std'] - baseline_cov_auc_stats['std']:+.2f} |\n")
+            f.write(f"| IQR | {baseline_cov_auc_stats['iqr']:.2f} | {enhanced_cov_auc_stats['iqr']:.2f} | {enhanced_cov_auc_stats['iqr'] - baseline_cov_auc_stats['iqr']:+.2f} |\n")
+            f.write(f"| Min AUC | {baseline_cov_auc_stats['min']:.2f} | {enhanced_cov_auc_stats['min']:.2f} | {enhanced_cov_auc_stats['min'] - baseline_cov_auc_stats['min']:+.2f} |\n")
+            f.write(f"| Max AUC | {baseline_cov_auc_stats['max']:.2f} | {enhanced_cov_auc_stats['max']:.2f} | {enhanced_cov_auc_stats['max'] - baseline_cov_auc_stats['max']:+.2f} |\n")
+            f.write(f"| Data Points | {baseline_cov_auc_stats['count']} | {enhanced_cov_auc_stats['count']} | - |\n\n")
+        
+            # --- MODIFIED TABLE SECTION 3 ---
+            # Final Coverage
+            f.write("### 🎯 Final Branch Coverage\n\n")
+            f.write("| Metric | Baseline | Enhanced | Difference |\n")
+            f.write("|--------|----------|----------|------------|\n")
+            f.write(f"| Average Coverage | {baseline_final_cov_stats['mean']:.2f}% | {enhanced_final_cov_stats['mean']:.2f}% | {enhanced_final_cov_stats['mean'] - baseline_final_cov_stats['mean']:+.2f}% |\n")
+            f.write(f"| Median Coverage | {baseline_final_cov_stats['median']:.2f}% | {enhanced_final_cov_stats['median']:.2f}% | {enhanced_final_cov_stats['median'] - baseline_final_cov_stats['median']:+.2f}% |\n")
+            f.write(f"| Std Deviation | {baseline_final_cov_stats['std']:.2f}% | {enhanced_final_cov_stats['std']:.2f}% | {enhanced_final_cov_stats['std'] - baseline_final_cov_stats['std']:+.2f}% |\n")
+            f.write(f"| IQR | {baseline_final_cov_stats['iqr']:.2f}% | {enhanced_final_cov_stats['iqr']:.2f}% | {enhanced_final_cov_stats['iqr'] - baseline_final_cov_stats['iqr']:+.2f}% |\n")
+            f.write(f"| Min Coverage | {baseline_final_cov_stats['min']:.2f}% | {enhanced_final_cov_stats['min']:.2f}% | {enhanced_final_cov_stats['min'] - baseline_final_cov_stats['min']:+.2f}% |\n")
+            f.write(f"| Max Coverage | {baseline_final_cov_stats['max']:.2f}% | {enhanced_final_cov_stats['max']:.2f}% | {enhanced_final_cov_stats['max'] - baseline_final_cov_stats['max']:+.2f}% |\n")
+            f.write(f"| Data Points | {baseline_final_cov_stats['count']} | {enhanced_final_cov_stats['count']} | - |\n\n")
+        
+            # --- ADD THE NEW STATISTICAL ANALYSIS SECTION TO THE REPORT ---
+            if with_stats:
+                f.write(run_and_format_stat_tests(baseline_auc, enhanced_auc))
+                f.write("\n")
+            if bootstrap:
+                f.write(format_bootstrap_intervals(baseline_auc, enhanced_auc, **bootstrap))
+                f.write("\n")
+            if saturation:
+                f.write(format_saturation_curves(baseline, enhanced, baseline_run_bitsets, enhanced_run_bitsets,
+                                                 **saturation))
+            if discovery_curves:
+                plot_file = None
+                if discovery_curves['plot']:
+                    plot_file = report_file[:report_file.index("_coverage_comparison_report_")] + "_fault_discovery_curves.png"
+                f.write(format_discovery_curves(baseline, enhanced, plot_file=plot_file,
+                                                title=f"{profile['title']}: fault discovery per test case"))
+            if browser_logs:
+                f.write(format_browser_logs(baseline, enhanced, fault_rules=profile['fault_rules'],
+                                            noise=profile['log_noise'], **browser_logs))
+            if coverage_timeline:
+                f.write(format_coverage_timeline(baseline, enhanced, **coverage_timeline))
+            if power:
+                f.write(format_power_analysis(baseline_auc, enhanced_auc, **power))
+            if prefix_stability:
+                plot_file = report_file[:-len(".md")] + "_prefix_stability.png" if prefix_stability['plot'] else None
+                f.write(format_prefix_stability(baseline, enhanced, baseline_run_bitsets, enhanced_run_bitsets,
+                                                min_runs=prefix_stability['min_runs'], plot_file=plot_file))
+
+            # --- NEW FAULT ANALYSIS SECTION ---
+            f.write("## 🐞 Unique Fault Discovery Analysis\n\n")
+            f.write(f"- **Total unique fault types (Baseline):** {len(baseline_faults)}\n")
+            f.write(f"- **Total unique fault types (Enhanced):** {len(enhanced_faults)}\n")
+            f.write(f"- **Shared fault types found by both:** {len(shared_faults)}\n")
+            f.write(f"- **Fault types found ONLY by Enhanced:** {len(faults_only_in_enhanced)}\n")
+            f.write(f"- **Fault types found ONLY by Baseline:** {len(faults_only_in_baseline)}\n\n")
+
+            f.write("### Fault Types Found ONLY by Enhanced Tool\n\n")
+            if faults_only_in_enhanced:
+                for fault in sorted(list(faults_only_in_enhanced)):
+                    f.write(f"- `{fault}`\n")
+            else:
+                f.write("*None found.*\n")
+            f.write("\n")
+
+            f.write("### Fault Types Found ONLY by Baseline Tool\n\n")
+            if faults_only_in_baseline:
+                for fault in sorted(list(faults_only_in_baseline)):
+                    f.write(f"- `{fault}`\n")
+            else:
+                f.write("*None found.*\n")
+            f.write("\n")
+        
+            # Summary statistics
+            f.write("## 📊 Branch Discovery Summary\n\n")
+            f.write(f"- **Total unique branches (Baseline):** {len(baseline_union)}\n")
+            f.write(f"- **Total unique branches (Enhanced):** {len(enhanced_union)}\n")
+            f.write(f"- **Shared branches:** {len(shared_branches)}\n")
+            f.write(f"- **Only in Enhanced:** {len(only_in_enhanced)}\n")
+            f.write(f"- **Only in Baseline:** {len(only_in_baseline)}\n\n")
+        
+            # Discovery advantage
+            f.write("## 🎯 Discovery Advantage\n\n")
+            f.write("### Branches found ONLY by Enhanced tool\n")
+            f.write(f"**Count:** {len(only_in_enhanced)}\n\n")
+        
+            if only_in_enhanced:
+                for branch in sorted(only_in_enhanced):
+                    hits = enhanced_hit_freq[branch_index.ids[branch]]
+                    f.write(f"- {format_branch_info(branch, location_index)} (hit in {hits}/{len(enhanced_files)} runs)\n")
+                # Add run-specific analysis for unique enhanced branches
+                f.write("\n#### Detailed Run Analysis for Enhanced-Only Branches\n\n")
+                for branch in sorted(only_in_enhanced):
+                    # Find which specific runs hit this branch
+                    hitting_runs = enhanced_run_bitsets.runs_for(branch)
+
+                    f.write(f"**{format_branch_info(branch, location_index)}**\n")
+                    f.write(f"- Hit in runs: {hitting_runs}\n")
+                    suite_paths = [
+                        f"{enhanced_manifest.tool_dir.name}/{run}/{suite_dir.name}/"
+                        for run in hitting_runs
+                        for suite_dir in enhanced_manifest.suite_dirs(run)
+                    ]
+                    f.write(f"- Test suites to examine: `{', '.join(suite_paths)}`\n\n")
+
+                    # Add pattern analysis
+                    if hitting_runs:
+                        patterns = analyze_test_patterns(hitting_runs, enhanced['test_features'])
+                        f.write(f"**Pattern Analysis for this branch:**\n")
+                        f.write(f"- Average test length: {statistics.mean(patterns['test_lengths']):.1f} method calls\n")
+                        f.write(f"- Most frequent methods: {', '.join([f'{method}({count})' for method, count in sorted(patterns['method_calls'].items(), key=lambda x: x[1], reverse=True)[:3]])}\n")
+                        f.write(f"- Common parameters: {', '.join([f'{param}({count})' for param, count in sorted(patterns['parameters'].items(), key=lambda x: x[1], reverse=True)[:3]])}\n\n")
+                    else:
+                        f.write("*None found*\n")
+        
+            f.write("\n### Branches found ONLY by Baseline tool\n")
+            f.write(f"**Count:** {len(only_in_baseline)}\n\n")
+        
+            if only_in_baseline:
+                for branch in sorted(only_in_baseline):
+                    hits = baseline_hit_freq[branch_index.ids[branch]]
+                    f.write(f"- {format_branch_info(branch, location_index)} (hit in {hits}/{len(baseline_files)} runs)\n")
+            else:
+                f.write("*None found*\n")
+        
+            # Consistency advantage
+            f.write("\n## 📊 Consistency Advantage\n\n")
+            f.write("### Branches Enhanced hits more consistently (≥10 runs vs <5 runs)\n")
+            f.write(f"**Count:** {len(enhanced_more_consistent)}\n\n")
+        
+            if enhanced_more_consistent:
+                for branch, enhanced_hits, baseline_hits in sorted(enhanced_more_consistent):
+                    f.write(f"- {format_branch_info(branch, location_index)}\n")
+                    f.write(f"  - Enhanced: {enhanced_hits}/{len(enhanced_files)} runs, Baseline: {baseline_hits}/{len(baseline_files)} runs\n")
+            else:
+                f.write("*None found*\n")
+        
+            f.write("\n### Branches Baseline hits more consistently (≥10 runs vs <5 runs)\n")
+            f.write(f"**Count:** {len(baseline_more_consistent)}\n\n")
+        
+            if baseline_more_consistent:
+                for branch, baseline_hits, enhanced_hits in sorted(baseline_more_consistent):
+                    f.write(f"- {format_branch_info(branch, location_index)}\n")
+                    f.write(f"  - Baseline: {baseline_hits}/{len(baseline_files)} runs, Enhanced: {enhanced_hits}/{len(enhanced_files)} runs\n")
+            else:
+                f.write("*None found*\n")
+
+            if branch_tests is not None:
+                f.write("\n")
+                f.write(format_branch_tests(branch_index, location_index, baseline_hit_freq, len(baseline_files),
+                                            enhanced_hit_freq, len(enhanced_files), shared_branches.mask(),
+                                            **branch_tests))
+        
+            f.write(f"\n📁 **Test files copied to:** `{test_files_dir}/` for manual inspection\n\n")
+
+
+    # Console summary
+    print("\n" + "="*80)
+    print("📈 COMPREHENSIVE COMPARISON SUMMARY")
+    print("="*80)
+    
+    # AUC Results
+    print(f"🚀 AUC Performance:")
+    print(f"   Fault Discovery (avg): Baseline {baseline_fault_stats['mean']:.4f} vs Enhanced {enhanced_fault_stats['mean']:.4f}")
+    print(f"   Coverage Growth (avg): Baseline {baseline_cov_auc_stats['mean']:.2f} vs Enhanced {enhanced_cov_auc_stats['mean']:.2f}")
+    print(f"   Final Coverage (avg): Baseline {baseline_final_cov_stats['mean']:.2f}% vs Enhanced {enhanced_final_cov_stats['mean']:.2f}%")
+
+    # NEW: Unique Fault Summary
+    print(f"\n🐞 Unique Fault Discovery:")
+    print(f"   Baseline: {len(baseline_faults)} unique fault types")
+    print(f"   Enhanced: {len(enhanced_faults)} unique fault types")
+    print(f"   Shared: {len(shared_faults)} fault types")
+    print(f"   Fault types ONLY Enhanced finds: {len(faults_only_in_enhanced)}")
+    print(f"   Fault types ONLY Baseline finds: {len(faults_only_in_baseline)}")
+    
+    print(f"\n🔢 Branch Discovery:")
+    print(f"   Baseline: {len(baseline_union)} unique branches")
+    print(f"   Enhanced: {len(enhanced_union)} unique branches")
+    print(f"   Shared: {len(shared_branches)} branches")
+    
+    print(f"\n🎯 Discovery results:")
+    print(f"   Branches ONLY Enhanced finds: {len(only_in_enhanced)}")
+    print(f"   Branches ONLY Baseline finds: {len(only_in_baseline)}")
+    
+    print(f"\n📊 Consistency results:")
+    print(f"   Enhanced more consistent: {len(enhanced_more_consistent)}")
+    print(f"   Baseline more consistent: {len(baseline_more_consistent)}")
+
+    if report_file is not None:
+        print(f"\n📝 Detailed report saved to: {report_file}")
+    
+    # Key insights
+    print(f"\n💡 Key insights:")
+    
+    # AUC insights
+    fault_diff = enhanced_fault_stats['mean'] - baseline_fault_stats['mean']
+    cov_auc_diff = enhanced_cov_auc_stats['mean'] - baseline_cov_auc_stats['mean']
+    final_cov_diff = enhanced_final_cov_stats['mean'] - baseline_final_cov_stats['mean']
+    
+    if fault_diff > 0.01:
+        print(f"   ✅ Enhanced has {fault_diff:.3f} better fault discovery score on average")
+    elif fault_diff < -0.01:
+        print(f"   ⚠️  Baseline has {abs(fault_diff):.3f} better fault discovery score on average")
+    
+    if cov_auc_diff > 5:
+        print(f"   ✅ Enhanced has {cov_auc_diff:.1f} higher coverage growth AUC on average")
+    elif cov_auc_diff < -5:
+        print(f"   ⚠️  Baseline has {abs(cov_auc_diff):.1f} higher coverage growth AUC on average")
+    
+    if final_cov_diff > 1:
+        print(f"   ✅ Enhanced achieves {final_cov_diff:.1f}% higher final coverage on average")
+    elif final_cov_diff < -1:
+        print(f"   ⚠️  Baseline achieves {abs(final_cov_diff):.1f}% higher final coverage on average")
+    
+    # Branch discovery insights
+    if len(only_in_enhanced) > 0:
+        print(f"   ✅ Enhanced discovers {len(only_in_enhanced)} unique branches never found by baseline")
+    if len(enhanced_more_consistent) > 0:
+        print(f"   ✅ Enhanced shows better consistency on {len(enhanced_more_consistent)} branches")
+
+    # NEW: Fault discovery insights
+    if len(faults_only_in_enhanced) > 0:
+        print(f"   ✅ Enhanced discovers {len(faults_only_in_enhanced)} unique fault types never found by baseline")
+    
+    if (len(only_in_enhanced) == 0 and len(enhanced_more_consistent) == 0 and 
+        fault_diff <= 0.01 and cov_auc_diff <= 5 and final_cov_diff <= 1 and len(faults_only_in_enhanced) == 0):
+        print(f"   ⚠️  Enhanced shows limited advantages in this analysis")
+        print(f"   💭 Consider: Are there other metrics to explore? Different thresholds?")
+    else:
+        print(f"   🎉 Enhanced tool shows measurable improvements in multiple metrics!")
+
+    return {
+        'app': app,
+        'baseline_tool': baseline_tool,
+        'enhanced_tool': enhanced_tool,
+        'report_file': report_file,
+        'runs': (len(baseline_files), len(enhanced_files)),
+        'fault_score': (baseline_fault_stats['mean'], enhanced_fault_stats['mean']),
+        'coverage_auc': (baseline_cov_auc_stats['mean'], enhanced_cov_auc_stats['mean']),
+        'final_coverage': (baseline_final_cov_stats['mean'], enhanced_final_cov_stats['mean']),
+        'branches': (len(baseline_union), len(enhanced_union)),
+        'only_branches': (len(only_in_baseline), len(only_in_enhanced)),
+        'faults': (len(baseline_faults), len(enhanced_faults)),
+        'only_faults': (len(faults_only_in_baseline), len(faults_only_in_enhanced)),
+    }
+
+
+def parse_comparison(spec):
+    """Parse an `app[:tool_a:tool_b]` comparison spec into an (app, tool_a, tool_b) tuple."""
+    parts = spec.split(':')
+    if len(parts) == 1:
+        parts += ["baseline", "enhanced"]
+    if len(parts) != 3 or not all(parts):
+        raise ValueError(f"Invalid comparison '{spec}', expected app or app:tool_a:tool_b")
+    if parts[0] not in APP_PROFILES:
+        raise ValueError(f"Unknown app '{parts[0]}' (known: {', '.join(sorted(APP_PROFILES))})")
+    return tuple(parts)
+
+
+def read_batch_file(path):
+    """
+    Read comparisons from a batch file: one `app tool_a tool_b` (or `app:tool_a:tool_b`)
+    per line; blank lines and lines starting with # are ignored.
+    """
+    comparisons = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                comparisons.append(parse_comparison(':'.join(line.split())))
+    return comparisons
+
+
+def write_batch_summary(summaries):
+    """Write a cross-app Markdown summary of several comparisons. Returns the file name."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_file = f"batch_comparison_summary_{timestamp}.md"
+
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        f.write("# Cross-App Comparison Summary\n\n")
+        f.write(f"**Generated:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write("Each pair of values is *Baseline / Enhanced* (tool A / tool B).\n\n")
+        f.write("| App | Tool A | Tool B | Runs | Fault Score (avg) | Coverage AUC (avg) | Final Coverage (avg) | Branches | Only-in Branches | Fault Types | Only-in Fault Types | Report |\n")
+        f.write("|:---|:---|:---|:---:|:---:|:---:|:---:|:---:|:---:|:---:|:---:|:---|\n")
+        for summary in summaries:
+            report_link = f"`{summary['report_file']}`" if summary['report_file'] else "-"
+            f.write(
+                f"| {summary['app']} | {summary['baseline_tool']} | {summary['enhanced_tool']} "
+                f"| {summary['runs'][0]} / {summary['runs'][1]} "
+                f"| {summary['fault_score'][0]:.4f} / {summary['fault_score'][1]:.4f} "
+                f"| {summary['coverage_auc'][0]:.2f} / {summary['coverage_auc'][1]:.2f} "
+                f"| {summary['final_coverage'][0]:.2f}% / {summary['final_coverage'][1]:.2f}% "
+                f"| {summary['branches'][0]} / {summary['branches'][1]} "
+                f"| {summary['only_branches'][0]} / {summary['only_branches'][1]} "
+                f"| {summary['faults'][0]} / {summary['faults'][1]} "
+                f"| {summary['only_faults'][0]} / {summary['only_faults'][1]} "
+                f"| {report_link} |\n"
+            )
+    return summary_file
+
+
+def run_batch(comparisons, store, workers=1, **report_options):
+    """
+    Run several (app, tool_a, tool_b) comparisons.
+    Every distinct dataset is ingested once, in parallel across `workers`
+    processes; the comparisons then reuse the loaded datasets. When more than
+    one comparison ran, a cross-app summary is written as well (unless summary_only).
+    report_options (summary_only, with_stats, bootstrap, branch_tests, saturation,
+    prefix_stability, power, coverage_timeline, discovery_curves, browser_logs)
+    are passed on to analyze_coverage_comparison.
+    Returns the list of summary dicts of the comparisons that succeeded.
+    """
+    comparisons = list(dict.fromkeys(comparisons))
+    keys = [(app, tool) for app, tool_a, tool_b in comparisons for tool in (tool_a, tool_b)]
+
+    print(f"🔍 Loading {len(set(keys))} datasets for {len(comparisons)} comparisons...")
+    store.preload(keys, workers=workers)
+
+    summaries = []
+    for app, tool_a, tool_b in comparisons:
+        summary = analyze_coverage_comparison(app, store, tool_a, tool_b, **report_options)
+        if summary is not None:
+            summaries.append(summary)
+
+    if len(comparisons) > 1 and summaries and not report_options.get('summary_only'):
+        summary_file = write_batch_summary(summaries)
+        print(f"\n📝 Cross-app summary saved to: {summary_file}")
+    return summaries
+
+
+def watch_comparisons(comparisons, store, workers=1, interval=5.0, polling=False, **report_options):
+    """
+    Run the comparisons, then keep watching the result trees and re-run the
+    comparisons affected whenever runs complete (or completed runs change).
+    Only the changed runs are parsed again; everything else comes from the
+    store's ResultsStore. report_options are passed on to run_batch. Stops on Ctrl+C.
+    """
+    comparisons = list(dict.fromkeys(comparisons))
+    keys = list(dict.fromkeys((app, tool) for app, tool_a, tool_b in comparisons for tool in (tool_a, tool_b)))
+
+    def snapshot():
+        state = {}
+        for app, tool in keys:
+            manifest = store.scan(app, tool)
+            runs = manifest.runs if manifest is not None else []
+            state[(app, tool)] = tuple((run.run_num, run_signature(run)) for run in runs)
+        return state
+
+    def watch_paths():
+        paths = [store.base_dir]
+        for app, tool in keys:
+            profile = APP_PROFILES[app]
+            manifest = scan_tool_runs(store.base_dir, app, tool, profile['tool_dir_pattern'], profile['suite_pattern'])
+            if manifest is None:
+                continue
+            paths.append(manifest.tool_dir)
+            for run in manifest.runs:
+                paths.append(run.run_dir)
+                paths.extend(suite.suite_dir for suite in run.suites)
+        return paths
+
+    state = snapshot()
+    run_batch(comparisons, store, workers=workers, **report_options)
+
+    watcher = make_watcher(interval, polling)
+    print(f"\n👀 Watching {store.base_dir} for completed runs ({type(watcher).__name__}, Ctrl+C to stop)...")
+    try:
+        while True:
+            watcher.watch(watch_paths())
+            watcher.wait()
+            new_state = snapshot()
+            changed = [key for key in keys if new_state[key] != state[key]]
+            if not changed:
+                continue
+            state = new_state
+
+            for app, tool in changed:
+                print(f"\n🔔 {app} {tool}: {len(state[(app, tool)])} completed runs")
+                store.invalidate(app, tool)
+            affected = [c for c in comparisons if (c[0], c[1]) in changed or (c[0], c[2]) in changed]
+            run_batch(affected, store, workers=workers, **report_options)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        watcher.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare baseline vs enhanced coverage and AUC metrics.")
+    parser.add_argument("--app", action="append", default=[], choices=sorted(APP_PROFILES),
+                        help="Application to analyse (baseline vs enhanced); repeat to analyse several apps in one process")
+    parser.add_argument("--compare", action="append", default=[], metavar="APP:TOOL_A:TOOL_B",
+                        help="Compare two tool variants of an app (TOOL_A takes the Baseline role); repeatable")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="File listing comparisons, one 'app tool_a tool_b' per line")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Datasets ingested in parallel when several are needed (0 = one per CPU)")
+    parser.add_argument("--base-dir", default=".", help="Directory containing the <app>-<tool>-<N>-run-cc result folders")
+    parser.add_argument("--max-runs", type=int, default=None,
+                        help="Only analyse the first N runs of each tool (overrides the app profile)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes used to decode coverage files (0 = one per CPU)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for parsed coverage cache entries (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB,
+                        help=f"Evict least recently used cache entries above this size (default: {DEFAULT_MAX_MB} MB)")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode coverage JSON, bypassing the cache")
+    parser.add_argument("--results-db", metavar="FILE",
+                        help="SQLite results store; only runs not yet in it (or changed since) are parsed")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Only print the console summary: no report, no test file copies, no statistics")
+    parser.add_argument("--no-stats", action="store_true",
+                        help="Leave the statistical significance section out of the report")
+    parser.add_argument("--bootstrap", type=int, default=0, metavar="RESAMPLES",
+                        help=f"Add bootstrap confidence intervals from RESAMPLES resamples (e.g. {DEFAULT_RESAMPLES}; 0 = off)")
+    parser.add_argument("--saturation", type=int, default=0, metavar="ORDERINGS",
+                        help=f"Add branch/fault saturation curves over ORDERINGS random run orderings (e.g. {DEFAULT_ORDERINGS}; 0 = off)")
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE,
+                        help=f"Confidence level of the bootstrap intervals, saturation and coverage-over-time bands (default: {DEFAULT_CONFIDENCE})")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the bootstrap resampling, saturation orderings and power simulations (default: 0)")
+    parser.add_argument("--coverage-timeline", type=int, nargs="?", const=DEFAULT_GRID_POINTS, default=None,
+                        metavar="POINTS",
+                        help=f"Add coverage-vs-time curves on a shared grid of POINTS times (default {DEFAULT_GRID_POINTS}) and time-normalized AUCs")
+    parser.add_argument("--discovery-curves", action="store_true",
+                        help="Add fault-discovery curves aggregated over all runs (mean, median, quantile bands)")
+    parser.add_argument("--discovery-plot", action="store_true",
+                        help="With --discovery-curves, also write one comparison PNG per app (redrawn only when its inputs change)")
+    parser.add_argument("--browser-logs", action="store_true",
+                        help=f"Add a console log analysis streamed from every run's {LOG_FILE} (levels, time to first fault, fault timeline)")
+    parser.add_argument("--power", type=int, default=0, metavar="SIMULATIONS",
+                        help=f"Add a power analysis from SIMULATIONS simulated campaigns (e.g. {DEFAULT_SIMULATIONS}; 0 = off)")
+    parser.add_argument("--power-runs", type=parse_run_counts, default=None, metavar="N,N,...",
+                        help=f"Run counts evaluated by --power (default: {','.join(map(str, DEFAULT_RUN_COUNTS))} and the current count)")
+    parser.add_argument("--power-target", type=float, default=DEFAULT_TARGET_POWER,
+                        help=f"Power that --power reports the required run count for (default: {DEFAULT_TARGET_POWER})")
+    parser.add_argument("--prefix-stability", type=int, nargs="?", const=DEFAULT_MIN_RUNS, default=None,
+                        metavar="MIN_RUNS",
+                        help=f"Add a table of every statistic using only the first k runs, k = MIN_RUNS..N (default {DEFAULT_MIN_RUNS})")
+    parser.add_argument("--stability-plot", action="store_true",
+                        help="With --prefix-stability, also write a PNG plot next to the report (needs matplotlib)")
+    parser.add_argument("--branch-tests", action="store_true",
+                        help="Add per-branch Fisher exact tests (Benjamini-Hochberg FDR) and a consistency threshold sweep")
+    parser.add_argument("--fdr", type=float, default=0.05,
+                        help="False discovery rate of the per-branch tests (default: 0.05)")
+    parser.add_argument("--threshold-grid", type=parse_threshold_grid, default=None, metavar="HIGHS:LOWS",
+                        help="Thresholds swept with --branch-tests, e.g. 10,15,20:1,5 (default: fractions of the run count)")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"Keep running and refresh the reports as runs complete (uses --results-db, default {DEFAULT_RESULTS_DB})")
+    parser.add_argument("--watch-interval", type=float, default=5.0,
+                        help="Seconds between rescans when polling, and settle time after changes (default: 5)")
+    parser.add_argument("--poll", action="store_true", help="In --watch mode, poll instead of using inotify")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        comparisons = [parse_comparison(app) for app in args.app]
+        comparisons += [parse_comparison(spec) for spec in args.compare]
+        if args.batch:
+            comparisons += read_batch_file(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(2)
+    if not comparisons:
+        print("❌ Nothing to compare: pass --app, --compare or --batch", file=sys.stderr)
+        sys.exit(2)
+
+    cache = None if args.no_cache else CoverageCache(args.cache_dir, args.cache_max_mb)
+    results_db = args.results_db or (DEFAULT_RESULTS_DB if args.watch else None)
+    results = ResultsStore(results_db) if results_db else None
+    store = DatasetStore(args.base_dir, jobs=args.jobs or os.cpu_count(), cache=cache,
+                         max_runs=args.max_runs, results=results, complete_only=args.watch)
+    try:
+        report_options = {'summary_only': args.summary_only, 'with_stats': not args.no_stats}
+        if args.bootstrap > 0:
+            report_options['bootstrap'] = {
+                'resamples': args.bootstrap,
+                'confidence': args.confidence,
+                'seed': args.seed,
+                'jobs': args.jobs or os.cpu_count(),
+            }
+        if args.saturation > 0:
+            report_options['saturation'] = {
+                'orderings': args.saturation,
+                'confidence': args.confidence,
+                'seed': args.seed,
+            }
+        if args.coverage_timeline is not None:
+            report_options['coverage_timeline'] = {'points': args.coverage_timeline, 'confidence': args.confidence}
+        if args.discovery_curves:
+            report_options['discovery_curves'] = {'plot': args.discovery_plot}
+        if args.browser_logs:
+            report_options['browser_logs'] = {'jobs': args.jobs or os.cpu_count()}
+        if args.power > 0:
+            report_options['power'] = {
+                'simulations': args.power,
+                'run_counts': args.power_runs,
+                'target': args.power_target,
+                'seed': args.seed,
+            }
+        if args.prefix_stability is not None:
+            report_options['prefix_stability'] = {'min_runs': args.prefix_stability, 'plot': args.stability_plot}
+        if args.branch_tests:
+            report_options['branch_tests'] = {'fdr': args.fdr, 'grid': args.threshold_grid}
+        if args.watch:
+            watch_comparisons(comparisons, store, workers=args.workers or os.cpu_count(),
+                              interval=args.watch_interval, polling=args.poll, **report_options)
+        else:
+            run_batch(comparisons, store, workers=args.workers or os.cpu_count(), **report_options)
+    finally:
+        if results is not None:
+            results.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of parsed Istanbul coverage runs.
+
+Each coverage-final.json is reduced to flat hit arrays (branches, statements,
+functions and branch locations) and stored as one .npz file per run, so warm
+re-runs of the comparison scripts never have to decode the JSON again.
+
+Entries are validated against the source file's size and mtime; when those
+changed (e.g. the results were copied) the content hash decides whether the
+entry is still valid. The cache directory is kept under a size cap by evicting
+the least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from coverage_ingest import CoverageLayout, known_layout, shared_layout
+
+# Bump whenever the layout of the stored arrays changes; older entries are then ignored.
+CACHE_VERSION = 3
+DEFAULT_CACHE_DIR = ".msc_cache"
+DEFAULT_MAX_MB = 512
+
+
+def file_sha256(data):
+    """Return the hex SHA-256 digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _pack_keys(keys, files, file_index, with_path=False):
+    """
+    Flatten a list of (file_path, id[, path_index]) keys into parallel arrays.
+    File paths are interned into the shared `files` list to keep the entry small.
+    """
+    file_col, id_col, path_col = [], [], []
+    for key in keys:
+        file_path = key[0]
+        if file_path not in file_index:
+            file_index[file_path] = len(files)
+            files.append(file_path)
+        file_col.append(file_index[file_path])
+        id_col.append(key[1])
+        if with_path:
+            path_col.append(key[2])
+
+    arrays = {
+        'file': np.array(file_col, dtype=np.int32),
+        'id': np.array(id_col, dtype=str),
+    }
+    if with_path:
+        arrays['path'] = np.array(path_col, dtype=np.int32)
+    return arrays
+
+
+def pack_run_coverage(run_coverage):
+    """
+    Convert a run_coverage dict (see coverage_ingest.read_run_coverage) into a
+    dict of NumPy arrays suitable for np.savez.
+    """
+    layout = run_coverage['layout']
+    files = []
+    file_index = {}
+    arrays = {'fingerprint': np.array(layout.fingerprint)}
+
+    sections = (
+        ('branches', layout.branch_keys, True),
+        ('statements', layout.statement_keys, False),
+        ('functions', layout.function_keys, False),
+    )
+    for section, keys, with_path in sections:
+        for column, values in _pack_keys(keys, files, file_index, with_path).items():
+            arrays[f"{section}_{column}"] = values
+        arrays[f"{section}_hits"] = np.asarray(run_coverage[section], dtype=np.int64)
+
+    # Locations are stored aligned with the branch keys; line -1 marks an unknown location.
+    branch_locations = [layout.locations.get(key, (-1, -1, '', '')) for key in layout.branch_keys]
+    arrays['branches_line'] = np.array([loc[0] for loc in branch_locations], dtype=np.int32)
+    arrays['branches_column'] = np.array([loc[1] for loc in branch_locations], dtype=np.int32)
+    arrays['branches_type'] = np.array([loc[2] for loc in branch_locations], dtype=str)
+    arrays['branches_function'] = np.array([loc[3] for loc in branch_locations], dtype=str)
+
+    arrays['files'] = np.array(files, dtype=str)
+    return arrays
+
+
+def _unpack_layout(arrays, fingerprint):
+    """Rebuild the CoverageLayout stored in a cache entry."""
+    files = arrays['files'].tolist()
+
+    def keys(section, with_path):
+        file_col = arrays[f"{section}_file"].tolist()
+        id_col = arrays[f"{section}_id"].tolist()
+        if with_path:
+            path_col = arrays[f"{section}_path"].tolist()
+            return [(files[f], i, p) for f, i, p in zip(file_col, id_col, path_col)]
+        return [(files[f], i) for f, i in zip(file_col, id_col)]
+
+    branch_keys = keys('branches', True)
+    location_columns = zip(
+        branch_keys,
+        arrays['branches_line'].tolist(),
+        arrays['branches_column'].tolist(),
+        arrays['branches_type'].tolist(),
+        arrays['branches_function'].tolist()
+    )
+    locations = {
+        key: (line, column, branch_type, function_name)
+        for key, line, column, branch_type, function_name in location_columns
+        if line >= 0
+    }
+    return CoverageLayout(branch_keys, keys('statements', False), keys('functions', False),
+                          locations, fingerprint=fingerprint)
+
+
+def unpack_run_coverage(arrays):
+    """
+    Inverse of pack_run_coverage. The layout is only rebuilt when no equal
+    layout has been registered in this process yet.
+    """
+    fingerprint = str(arrays['fingerprint'])
+    layout = known_layout(fingerprint) or shared_layout(_unpack_layout(arrays, fingerprint))
+    return {
+        'layout': layout,
+        'branches': arrays['branches_hits'],
+        'statements': arrays['statements_hits'],
+        'functions': arrays['functions_hits'],
+    }
+
+
+class CoverageCache:
+    """
+    Directory of .npz entries, one per coverage-final.json, keyed by the source path.
+    Instances only hold plain settings so they can be handed to worker processes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def entry_path(self, source_file):
+        key = hashlib.sha1(str(Path(source_file).resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, source_file):
+        """
+        Return the cached run_coverage for source_file, or None on a miss.
+        A hit refreshes the entry's mtime, which is what the LRU eviction uses.
+        """
+        entry = self.entry_path(source_file)
+        if not entry.exists():
+            return None
+
+        try:
+            with np.load(entry, allow_pickle=False) as npz:
+                meta = json.loads(str(npz['meta']))
+                if meta.get('version') != CACHE_VERSION:
+                    return None
+
+                st = os.stat(source_file)
+                if meta['size'] != st.st_size or meta['mtime_ns'] != st.st_mtime_ns:
+                    # Size/mtime changed: fall back to the content hash before giving up.
+                    if meta['size'] != st.st_size:
+                        return None
+                    with open(source_file, 'rb') as f:
+                        if file_sha256(f.read()) != meta['sha256']:
+                            return None
+
+                arrays = {name: npz[name] for name in npz.files if name != 'meta'}
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable cache entry {entry}: {e}", file=sys.stderr)
+            return None
+
+        run_coverage = unpack_run_coverage(arrays)
+        if meta['mtime_ns'] != st.st_mtime_ns:
+            # Same content under a new mtime: re-key the entry so the next lookup is cheap.
+            self.put(source_file, run_coverage, meta['sha256'])
+        else:
+            os.utime(entry)
+        return run_coverage
+
+    def put(self, source_file, run_coverage, sha256):
+        """Store run_coverage for source_file. Writes are atomic, so workers may share the directory."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            st = os.stat(source_file)
+            meta = {
+                'version': CACHE_VERSION,
+                'path': str(Path(source_file).resolve()),
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': sha256,
+            }
+            arrays = pack_run_coverage(run_coverage)
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+                os.replace(tmp_path, self.entry_path(source_file))
+            except BaseException:
+                # prune() only sees .npz entries, so a leftover temp file would never be evicted.
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except Exception as e:
+            print(f"⚠️  Could not write cache entry for {source_file}: {e}", file=sys.stderr)
+
+    def prune(self):
+        """Evict least recently used entries until the cache fits under max_bytes."""
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npz') and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Streaming ingestion of Istanbul coverage-final.json files.
+
+A coverage file is a single JSON object with one entry per instrumented source
+file. Instead of decoding the whole document, iter_json_object_items decodes
+one top-level entry at a time, so at most one source file's maps are alive
+while a run is reduced.
+
+Each run is reduced to flat hit vectors (branches, statements, functions) plus a
+CoverageLayout describing what each vector position means. Runs of the same
+instrumented build produce identical layouts, and shared_layout() makes them
+share one copy, so memory grows only by the hit vectors as runs are added.
+"""
+
+import codecs
+import hashlib
+import json
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_object_items(path, digest=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the (key, value) pairs of the top-level JSON object in `path`,
+    decoding one value at a time from a bounded buffer.
+    If `digest` (a hashlib object) is given, it is updated with the raw file bytes.
+    Raises json.JSONDecodeError for malformed input.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    with open(path, 'rb') as f:
+        buf = ''
+        pos = 0
+        eof = False
+
+        def read_more(size=chunk_size):
+            nonlocal buf, pos, eof
+            chunk = f.read(size)
+            if digest is not None:
+                digest.update(chunk)
+            if not chunk:
+                eof = True
+            # Drop what has already been consumed before growing the buffer.
+            buf = buf[pos:] + text_decoder.decode(chunk, final=not chunk)
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                read_more()
+
+        def expect(chars):
+            nonlocal pos
+            skip_whitespace()
+            if pos >= len(buf) or buf[pos] not in chars:
+                raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+            pos += 1
+            return buf[pos - 1]
+
+        def decode_value():
+            nonlocal pos
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    # At least double the undecoded text, so a value spanning many
+                    # chunks is re-decoded O(log n) times rather than once per chunk.
+                    read_more(max(chunk_size, len(buf) - pos))
+                    continue
+                if end == len(buf) and not eof:
+                    # A number may continue in the next chunk; make sure it is complete.
+                    read_more()
+                    continue
+                pos = end
+                return value
+
+        expect('{')
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == '}':
+            return
+
+        while True:
+            key = decode_value()
+            expect(':')
+            value = decode_value()
+            yield key, value
+            if expect(',}') == '}':
+                break
+
+        # Keep the digest complete even though the object has ended.
+        while not eof:
+            read_more()
+
+
+def _enclosing_function(functions, line, column):
+    """
+    Return the name of the innermost function in `functions` (a list of
+    (start, end, name) tuples from fnMap) whose body contains (line, column).
+    """
+    name = None
+    innermost_start = None
+    for start, end, fn_name in functions:
+        if start <= (line, column) <= end and (innermost_start is None or start >= innermost_start):
+            name = fn_name
+            innermost_start = start
+    return name
+
+
+class CoverageLayout:
+    """
+    Shared meaning of a run's hit vectors:
+    branch_keys[i] is the (file_path, branch_id, path_index) of branch hit i,
+    statement_keys / function_keys are (file_path, id) pairs, and locations maps
+    branch keys to (line, column, branch_type, function_name).
+
+    With `functions` ({file_path: fnMap (start, end, name) tuples}), `locations`
+    holds (line, column, branch_type) and the enclosing function names are
+    looked up on first access. Runs that shared_layout() maps onto an existing layout
+    are thrown away before that, so the lookup runs once per distinct layout.
+    """
+
+    __slots__ = ('branch_keys', 'statement_keys', 'function_keys', '_locations', '_functions', 'fingerprint')
+
+    def __init__(self, branch_keys, statement_keys, function_keys, locations, file_hashes=(), fingerprint=None,
+                 functions=None):
+        self.branch_keys = branch_keys
+        self.statement_keys = statement_keys
+        self.function_keys = function_keys
+        self._locations = locations
+        self._functions = functions
+
+        if fingerprint is None:
+            digest = hashlib.sha1()
+            for part in (file_hashes, branch_keys, statement_keys, function_keys):
+                digest.update(repr(part).encode('utf-8'))
+            fingerprint = digest.hexdigest()
+        self.fingerprint = fingerprint
+
+    @property
+    def locations(self):
+        if self._functions is not None:
+            self._locations = {
+                key: (line, column, branch_type,
+                      _enclosing_function(self._functions.get(key[0], ()), line, column) or '')
+                for key, (line, column, branch_type) in self._locations.items()
+            }
+            self._functions = None
+        return self._locations
+
+
+_SHARED_LAYOUTS = {}
+
+
+def shared_layout(layout):
+    """Return the canonical CoverageLayout equal to `layout`, registering it if new."""
+    return _SHARED_LAYOUTS.setdefault(layout.fingerprint, layout)
+
+
+def known_layout(fingerprint):
+    """Return the registered CoverageLayout with this fingerprint, or None."""
+    return _SHARED_LAYOUTS.get(fingerprint)
+
+
+def read_run_coverage(coverage_file, digest=None):
+    """
+    Stream one coverage-final.json and reduce it to a run_coverage dict:
+    {'layout': CoverageLayout, 'branches': hits, 'statements': hits, 'functions': hits}
+    where the hit vectors are int64 arrays aligned with the layout's keys.
+    """
+    branch_keys, branch_hits = [], []
+    statement_keys, statement_hits = [], []
+    function_keys, function_hits = [], []
+    locations = {}
+    functions = {}
+    file_hashes = []
+
+    for file_path, file_data in iter_json_object_items(coverage_file, digest):
+        file_hashes.append((file_path, file_data.get('hash')))
+
+        functions[file_path] = [
+            ((fn['loc']['start']['line'], fn['loc']['start']['column']),
+             (fn['loc']['end']['line'], fn['loc']['end']['column']),
+             fn.get('name', ''))
+            for fn in file_data.get('fnMap', {}).values()
+            if 'loc' in fn
+        ]
+
+        branch_counts = file_data.get('b', {})
+        for branch_id, branch_meta in file_data.get('branchMap', {}).items():
+            branch_type = branch_meta.get('type', '')
+            for path_index, loc in enumerate(branch_meta.get('locations', [])):
+                locations[(file_path, branch_id, path_index)] = (loc['start']['line'], loc['start']['column'], branch_type)
+
+            for path_index, hit_count in enumerate(branch_counts.get(branch_id, [])):
+                branch_keys.append((file_path, branch_id, path_index))
+                branch_hits.append(hit_count)
+
+        for item_id, hit_count in file_data.get('s', {}).items():
+            statement_keys.append((file_path, item_id))
+            statement_hits.append(hit_count)
+
+        for item_id, hit_count in file_data.get('f', {}).items():
+            function_keys.append((file_path, item_id))
+            function_hits.append(hit_count)
+
+    layout = CoverageLayout(branch_keys, statement_keys, function_keys, locations, file_hashes, functions=functions)
+    return {
+        'layout': layout,
+        'branches': np.array(branch_hits, dtype=np.int64),
+        'statements': np.array(statement_hits, dtype=np.int64),
+        'functions': np.array(function_hits, dtype=np.int64),
+    }
+
+
+def merge_run_coverage(run_coverages):
+    """
+    Combine the coverage of several test suites of one run into a single
+    run_coverage by summing hit counts, the way Istanbul merges coverage.
+    Suites with the same layout are summed directly; otherwise the hit vectors
+    are merged key by key into a new layout.
+    """
+    first = run_coverages[0]
+    if len(run_coverages) == 1:
+        return first
+
+    if all(rc['layout'].fingerprint == first['layout'].fingerprint for rc in run_coverages):
+        return {
+            'layout': first['layout'],
+            'branches': sum(rc['branches'] for rc in run_coverages),
+            'statements': sum(rc['statements'] for rc in run_coverages),
+            'functions': sum(rc['functions'] for rc in run_coverages),
+        }
+
+    merged = {'branches': {}, 'statements': {}, 'functions': {}}
+    locations = {}
+    for rc in run_coverages:
+        layout = rc['layout']
+        locations.update(layout.locations)
+        sections = (
+            ('branches', layout.branch_keys),
+            ('statements', layout.statement_keys),
+            ('functions', layout.function_keys),
+        )
+        for section, keys in sections:
+            counts = merged[section]
+            for key, hit_count in zip(keys, rc[section].tolist()):
+                counts[key] = counts.get(key, 0) + hit_count
+
+    layout = CoverageLayout(list(merged['branches']), list(merged['statements']),
+                            list(merged['functions']), locations)
+    return {
+        'layout': shared_layout(layout),
+        'branches': np.array(list(merged['branches'].values()), dtype=np.int64),
+        'statements': np.array(list(merged['statements'].values()), dtype=np.int64),
+        'functions': np.array(list(merged['functions'].values()), dtype=np.int64),
+    }
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Vectorized branch coverage engine.
+
+Branch keys (file_path, branch_id, path_index) are interned into a dense integer
+index shared by every tool being compared, and each tool's hits are stored as a
+uint32 matrix of shape (runs, branches). Unions, hit frequencies, shared/only-in
+sets and consistency buckets are then plain array reductions, and set algebra
+across runs and tools works on packed bitsets (BranchSet / RunBitsets).
+"""
+
+import numpy as np
+
+
+class BranchIndex:
+    """
+    Dense, sorted index of branch keys.
+    Ids follow the natural sort order of the keys, so any id array produced by
+    np.flatnonzero is already sorted the same way as sorted(set_of_keys).
+    """
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.ids = {key: i for i, key in enumerate(self.keys)}
+
+    @classmethod
+    def from_runs(cls, *tool_files):
+        """Build the index from the branch keys of every run of every tool."""
+        keys = set()
+        for layout in unique_layouts(*tool_files):
+            keys.update(layout.branch_keys)
+        return cls(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def keys_for(self, branch_ids):
+        """Map an iterable of ids back to their branch keys."""
+        return [self.keys[i] for i in branch_ids]
+
+
+def unique_layouts(*tool_files):
+    """Distinct CoverageLayouts used by the runs of the given tools, in first-seen order."""
+    layouts = {}
+    for coverage_files in tool_files:
+        for _, run_coverage in coverage_files:
+            layout = run_coverage['layout']
+            layouts.setdefault(id(layout), layout)
+    return list(layouts.values())
+
+
+def build_location_index(*tool_files):
+    """
+    Build a one-time {(file_path, branch_id, path_index): location} index from the
+    shared run layouts, so report formatting never has to scan the runs.
+    Earlier tools/runs take precedence when several define the same branch.
+    """
+    location_index = {}
+    for layout in unique_layouts(*tool_files):
+        for branch_key, location in layout.locations.items():
+            location_index.setdefault(branch_key, location)
+    return location_index
+
+
+def build_hit_matrix(coverage_files, branch_index):
+    """
+    Build the (runs, branches) uint32 hit matrix for one tool.
+    Row r holds the hit counts of coverage_files[r]; branches a run does not
+    define are left at 0.
+    """
+    hits = np.zeros((len(coverage_files), len(branch_index)), dtype=np.uint32)
+    max_hits = np.iinfo(np.uint32).max
+    layout_ids = {}
+
+    for row, (_, run_coverage) in enumerate(coverage_files):
+        layout = run_coverage['layout']
+        ids = layout_ids.get(id(layout))
+        if ids is None:
+            # Runs sharing a layout share the key -> column mapping as well.
+            keys = layout.branch_keys
+            ids = np.fromiter(map(branch_index.ids.__getitem__, keys), dtype=np.intp, count=len(keys))
+            layout_ids[id(layout)] = ids
+        hits[row, ids] = np.clip(run_coverage['branches'], 0, max_hits)
+
+    return hits
+
+
+def hit_frequency(hits):
+    """Number of runs in which each branch was hit (hit_count > 0)."""
+    return np.count_nonzero(hits, axis=0)
+
+
+# Number of set bits in every possible byte, used to popcount packed bitmaps.
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits, axis=-1):
+    """Number of set bits along `axis` of a packed uint8 bitmap array."""
+    if hasattr(np, 'bitwise_count'):
+        # NumPy >= 2.0 has a native popcount ufunc.
+        return np.bitwise_count(bits).sum(axis=axis, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=axis, dtype=np.int64)
+
+
+class BranchSet:
+    """
+    Set of branch ids over a BranchIndex, stored as a packed bitmap
+    (one bit per interned branch).
+    Supports |, &, - and len() (popcount); ids() returns the members sorted.
+    """
+
+    __slots__ = ('bits', 'size')
+
+    def __init__(self, bits, size):
+        self.bits = bits
+        self.size = size
+
+    @classmethod
+    def from_mask(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask), mask.size)
+
+    @classmethod
+    def from_ids(cls, branch_ids, size):
+        mask = np.zeros(size, dtype=bool)
+        mask[np.asarray(branch_ids, dtype=np.intp)] = True
+        return cls.from_mask(mask)
+
+    def _check(self, other):
+        if self.size != other.size:
+            raise ValueError(f"BranchSet sizes differ ({self.size} vs {other.size})")
+
+    def union(self, other):
+        self._check(other)
+        return BranchSet(self.bits | other.bits, self.size)
+
+    def intersection(self, other):
+        self._check(other)
+        return BranchSet(self.bits & other.bits, self.size)
+
+    def difference(self, other):
+        self._check(other)
+        return BranchSet(self.bits & ~other.bits, self.size)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def popcount(self):
+        return int(popcount(self.bits))
+
+    __len__ = popcount
+
+    def __contains__(self, branch_id):
+        return bool((self.bits[branch_id >> 3] >> (7 - (branch_id & 7))) & 1)
+
+    def mask(self):
+        return np.unpackbits(self.bits, count=self.size).astype(bool)
+
+    def ids(self):
+        return np.flatnonzero(self.mask())
+
+
+class RunBitsets:
+    """
+    Per-run branch bitsets for one tool: a packed (runs, ceil(branches / 8))
+    uint8 matrix, one bit per interned branch per run.
+    Gives the branch set of any subset of runs and the runs covering a branch.
+    """
+
+    def __init__(self, hit_matrix, run_numbers, branch_index):
+        self.run_numbers = np.asarray(run_numbers)
+        self.branch_index = branch_index
+        self.bits = np.packbits(hit_matrix > 0, axis=1)
+
+    def _rows(self, runs):
+        if runs is None:
+            return self.bits
+        rows = np.flatnonzero(np.isin(self.run_numbers, list(runs)))
+        return self.bits[rows]
+
+    def run_set(self, run_num):
+        """Branches hit by a single run."""
+        return BranchSet(self._rows([run_num])[0].copy(), len(self.branch_index))
+
+    def union(self, runs=None):
+        """Branches hit by at least one of `runs` (all runs by default)."""
+        rows = self._rows(runs)
+        bits = np.bitwise_or.reduce(rows, axis=0) if len(rows) else np.zeros(self.bits.shape[1], dtype=np.uint8)
+        return BranchSet(bits, len(self.branch_index))
+
+    def intersection(self, runs=None):
+        """Branches hit by every one of `runs` (all runs by default)."""
+        rows = self._rows(runs)
+        bits = np.bitwise_and.reduce(rows, axis=0) if len(rows) else np.zeros(self.bits.shape[1], dtype=np.uint8)
+        return BranchSet(bits, len(self.branch_index))
+
+    def runs_covering(self, branch_id):
+        """Sorted run numbers whose bitset contains branch_id."""
+        column = (self.bits[:, branch_id >> 3] >> (7 - (branch_id & 7))) & 1
+        return self.run_numbers[column.astype(bool)].tolist()
+
+    def runs_for(self, branch_key):
+        """Like runs_covering, but looked up by branch key."""
+        branch_id = self.branch_index.ids.get(branch_key)
+        if branch_id is None:
+            return []
+        return self.runs_covering(branch_id)
+
+
+def compare_tools(baseline_union, enhanced_union, baseline_freq, enhanced_freq, high=10, low=5):
+    """
+    Set algebra and consistency buckets between two tools, given their union
+    BranchSets and per-branch hit frequencies over the same BranchIndex.
+    Returns a dict of BranchSets.
+    """
+    shared = baseline_union & enhanced_union
+
+    # "More consistent" means hit in at least `high` runs vs fewer than `low` runs
+    enhanced_consistent = BranchSet.from_mask((enhanced_freq >= high) & (baseline_freq < low))
+    baseline_consistent = BranchSet.from_mask((baseline_freq >= high) & (enhanced_freq < low))
+
+    return {
+        'only_in_enhanced': enhanced_union - baseline_union,
+        'only_in_baseline': baseline_union - enhanced_union,
+        'shared': shared,
+        'enhanced_more_consistent': shared & enhanced_consistent,
+        'baseline_more_consistent': shared & baseline_consistent,
+    }
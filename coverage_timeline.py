@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Coverage-vs-time curves rebuilt from the per-suite coverage-report<N>.txt files.
+
+Each coverage-report<N>.txt holds the Statements/Branches/Functions/Lines
+fractions after one step of the test-generation loop. results-auc.txt lists
+the Unix timestamp of every report it used ("Processing file: ...,
+Timestamp: ..."). Together they give a run's coverage timeline.
+
+Timelines of different lengths and durations are edge-padded into
+(runs, reports) matrices and resampled onto one shared time grid with a
+single batched searchsorted (linear interpolation between reports, final
+coverage held after the run ended). Mean curves, confidence bands and
+per-run areas are then array reductions over all runs at once.
+
+Areas follow results-auc.txt: the trapezoidal integral of coverage (in
+percent) over seconds, divided by 100. Dividing the area by the run's
+duration instead gives the duration-normalized AUC, the time-averaged coverage
+in percent, which can be compared between runs of different lengths.
+"""
+
+import re
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+COVERAGE_METRICS = ('Statements', 'Branches', 'Functions', 'Lines')
+DEFAULT_GRID_POINTS = 100
+
+_REPORT_NAME = re.compile(r"^coverage-report(\d+)\.txt$")
+_REPORT_LINE = re.compile(r"Name:\s*(\w+)\s+Percentage:\s*[0-9.]+%\s+Fraction:\s*(\d+)/(\d+)")
+_TIMESTAMP_LINE = re.compile(r"Processing file:\s*(\S+?),\s*Timestamp:\s*(\d+)")
+_LAST_REPORT_LINE = re.compile(r"Found last report file:\s*(\S+)")
+
+RunTimeline = namedtuple('RunTimeline', ['run_num', 'times', 'coverage'])
+RunTimeline.__doc__ = """
+One run's coverage timeline: times in seconds since its first report, and
+coverage, a (reports, len(COVERAGE_METRICS)) array of percentages.
+"""
+
+
+def parse_coverage_report(file_path):
+    """Percentages of COVERAGE_METRICS in one coverage-report<N>.txt (NaN where missing)."""
+    values = dict.fromkeys(COVERAGE_METRICS, np.nan)
+    with open(file_path, 'r') as f:
+        for match in _REPORT_LINE.finditer(f.read()):
+            name, covered, total = match.group(1), int(match.group(2)), int(match.group(3))
+            if name in values:
+                values[name] = 100.0 * covered / total if total else np.nan
+    return np.array([values[name] for name in COVERAGE_METRICS])
+
+
+def parse_report_timestamps(file_path):
+    """
+    ([(report file name, unix timestamp)], last report path or None) from a
+    results-auc.txt file.
+    """
+    with open(file_path, 'r') as f:
+        content = f.read()
+    last_report = _LAST_REPORT_LINE.search(content)
+    stamps = [(name, int(stamp)) for name, stamp in _TIMESTAMP_LINE.findall(content)]
+    return stamps, last_report.group(1) if last_report else None
+
+
+def _report_suite(run, last_report):
+    """The suite folder whose coverage reports results-auc.txt used."""
+    candidates = [suite for suite in run.suites if any(_REPORT_NAME.match(name) for name in suite.files)]
+    if last_report:
+        parts = re.split(r"[\\/]+", last_report)
+        for suite in candidates:
+            if suite.suite_dir.name in parts:
+                return suite
+    return candidates[-1] if candidates else None
+
+
+def load_run_timeline(run):
+    """
+    RunTimeline of one RunEntry, or None if it has no results-auc.txt timestamps
+    or none of the listed coverage reports exist.
+    """
+    if "results-auc.txt" not in run.files:
+        return None
+    stamps, last_report = parse_report_timestamps(run.run_dir / "results-auc.txt")
+    suite = _report_suite(run, last_report)
+    if not stamps or suite is None:
+        return None
+
+    points = sorted((stamp, name) for name, stamp in stamps if name in suite.files)
+    if not points:
+        return None
+    times = np.array([stamp for stamp, _ in points], dtype=float)
+    coverage = np.array([parse_coverage_report(suite.suite_dir / name) for _, name in points])
+    return RunTimeline(run.run_num, times - times[0], coverage)
+
+
+def _pad(timelines):
+    """Edge-padded (runs, reports) times and (runs, reports, metrics) coverage plus lengths."""
+    lengths = np.array([len(timeline.times) for timeline in timelines], dtype=np.int64)
+    width = int(lengths.max())
+    times = np.empty((len(timelines), width))
+    coverage = np.empty((len(timelines), width, len(COVERAGE_METRICS)))
+    for row, timeline in enumerate(timelines):
+        n = len(timeline.times)
+        times[row, :n], times[row, n:] = timeline.times, timeline.times[-1]
+        coverage[row, :n], coverage[row, n:] = timeline.coverage, timeline.coverage[-1]
+    return times, coverage, lengths
+
+
+def make_grid(timelines, points=DEFAULT_GRID_POINTS):
+    """Shared grid from 0 to the longest duration among all given timelines."""
+    horizon = max((timeline.times[-1] for timeline in timelines), default=0.0)
+    return np.linspace(0.0, horizon, points)
+
+
+def resample(timelines, grid):
+    """
+    (runs, len(grid), metrics) coverage of every timeline on the shared grid:
+    linear interpolation between reports, last value held after the run ended.
+    """
+    if not timelines:
+        return np.zeros((0, len(grid), len(COVERAGE_METRICS)))
+    times, coverage, _ = _pad(timelines)
+    runs, width = times.shape
+    grid = np.asarray(grid, dtype=float)
+
+    # Offset every row so one searchsorted over the flattened times serves all runs.
+    span = max(times.max(), grid.max()) + 1.0
+    offsets = np.arange(runs)[:, None] * span
+    flat = (times + offsets).ravel()
+    left = np.searchsorted(flat, (grid[None, :] + offsets).ravel(), side='right').reshape(runs, -1) - 1
+    left -= np.arange(runs)[:, None] * width
+    left = np.clip(left, 0, width - 1)
+    right = np.minimum(left + 1, width - 1)
+
+    rows = np.arange(runs)[:, None]
+    t0, t1 = times[rows, left], times[rows, right]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(t1 > t0, (grid[None, :] - t0) / (t1 - t0), 0.0)
+    weight = np.clip(weight, 0.0, 1.0)[:, :, None]
+    return coverage[rows, left] * (1 - weight) + coverage[rows, right] * weight
+
+
+def timeline_areas(timelines):
+    """
+    Per-run (area, duration): area is the trapezoidal integral of every metric's
+    coverage over the run's own timeline, in results-auc.txt units, shape
+    (runs, metrics); duration is in seconds, shape (runs,).
+    """
+    if not timelines:
+        return np.zeros((0, len(COVERAGE_METRICS))), np.zeros(0)
+    times, coverage, _ = _pad(timelines)
+    widths = np.diff(times, axis=1)[:, :, None]
+    area = ((coverage[:, 1:] + coverage[:, :-1]) / 2 * widths).sum(axis=1) / 100.0
+    return area, times[:, -1]
+
+
+def horizon_normalized_auc(resampled, grid):
+    """
+    Time-averaged coverage (percent) of resampled (runs, grid, metrics) curves
+    over the whole shared grid, shape (runs, metrics). Runs that ended early
+    keep their final coverage, so this rewards reaching coverage quickly.
+    """
+    grid = np.asarray(grid, dtype=float)
+    horizon = grid[-1] - grid[0]
+    if horizon <= 0:
+        return resampled[:, -1, :] if resampled.shape[1] else np.zeros((resampled.shape[0], len(COVERAGE_METRICS)))
+    widths = np.diff(grid)[None, :, None]
+    return ((resampled[:, 1:] + resampled[:, :-1]) / 2 * widths).sum(axis=1) / horizon
+
+
+def area_mismatches(timelines, areas, durations, reported):
+    """
+    [(run_num, recomputed, reported)] for runs whose recomputed Branches area
+    differs from the AUC in results-auc.txt by more than the rounding of the
+    reported percentages (2 decimals) and AUC (4 decimals) explains.
+    reported is {run_num: auc}.
+    """
+    branches = COVERAGE_METRICS.index('Branches')
+    mismatches = []
+    for timeline, area, duration in zip(timelines, areas[:, branches], durations):
+        value = reported.get(timeline.run_num)
+        if value is not None and abs(area - value) > 0.005 * duration / 100 + 0.5e-4:
+            mismatches.append((timeline.run_num, float(area), value))
+    return mismatches
+
+
+def timeline_bands(resampled, confidence=0.95):
+    """
+    Mean, lower and upper confidence bound of the mean (normal approximation),
+    and median of resampled (runs, grid, metrics) curves, each (grid, metrics).
+    """
+    runs = resampled.shape[0]
+    mean = resampled.mean(axis=0)
+    median = np.median(resampled, axis=0)
+    if runs > 1:
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * resampled.std(axis=0, ddof=1) / np.sqrt(runs)
+    else:
+        half_width = np.zeros_like(mean)
+    return mean, mean - half_width, mean + half_width, median
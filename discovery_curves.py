@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Fault-discovery curves aggregated over all runs of a tool.
+
+Every run writes its cumulative unique-fault count per test case to
+fault_discovery_rate.csv (and a discovery_curve.png of that single run). Here
+the CSVs of all runs are aligned by test case number into one (runs, tests)
+matrix: test case t goes to column t - 1, gaps repeat the previous count, and
+a run that stopped early keeps its final count. Mean, median and quantile
+bands are then reductions along the run axis.
+
+A comparison figure of several tools is drawn with matplotlib's Agg backend.
+Its inputs (the CSV bytes of every run and the band settings) are hashed, and
+the digest is stored next to the PNG, so an unchanged figure is not redrawn.
+"""
+
+import hashlib
+import io
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from fault_auc import FAULT_CSV, parse_discovery_table
+
+DEFAULT_BANDS = ((0.1, 0.9), (0.25, 0.75))
+# Bump whenever the figure layout changes, so cached figures are redrawn.
+FIGURE_VERSION = 1
+
+DiscoveryCurves = namedtuple('DiscoveryCurves', ['run_nums', 'tests', 'faults', 'lengths', 'digest'])
+DiscoveryCurves.__doc__ = """
+Aligned curves of one tool: faults is a (runs, tests) float matrix with the
+cumulative unique faults of run run_nums[i] after test case tests[j]; lengths
+is the last test case number of every run. digest is the SHA-256 of the CSVs
+the curves were read from.
+"""
+
+CurveBands = namedtuple('CurveBands', ['tests', 'mean', 'median', 'bands', 'active', 'runs'])
+CurveBands.__doc__ = """
+Summary of DiscoveryCurves per test case: mean and median cumulative faults,
+bands {(low, high): (low curve, high curve)} of run quantiles, active (how many
+runs got that far) and runs, the number of runs.
+"""
+
+
+def align_by_test(tables):
+    """
+    (runs, max test case) matrix of cumulative faults from (tests, faults)
+    tables. Columns before a run's first test case are 0; missing test case
+    numbers and columns after its last one repeat the previous count.
+    """
+    width = max((int(tests[-1]) for tests, _ in tables), default=0)
+    values = np.zeros((len(tables), width + 1))
+    present = np.zeros((len(tables), width + 1), dtype=bool)
+    present[:, 0] = True
+    for row, (tests, faults) in enumerate(tables):
+        keep = tests >= 1
+        values[row, tests[keep]] = faults[keep]
+        present[row, tests[keep]] = True
+    # Forward fill: every column takes the value of the last present column at or before it.
+    source = np.maximum.accumulate(np.where(present, np.arange(width + 1), 0), axis=1)
+    return np.take_along_axis(values, source, axis=1)[:, 1:]
+
+
+def load_discovery_curves(runs):
+    """
+    DiscoveryCurves of RunEntry objects; runs without a readable
+    fault_discovery_rate.csv are left out.
+    """
+    digest = hashlib.sha256()
+    run_nums, tables = [], []
+    for run in runs:
+        if FAULT_CSV not in run.files:
+            continue
+        try:
+            data = (run.run_dir / FAULT_CSV).read_bytes()
+        except OSError:
+            continue
+        table = parse_discovery_table(io.StringIO(data.decode('utf-8', errors='replace'), newline=''))
+        if table is None:
+            continue
+        digest.update(f"{run.run_num}:{len(data)}:".encode('utf-8'))
+        digest.update(data)
+        run_nums.append(run.run_num)
+        tables.append(table)
+    faults = align_by_test(tables)
+    lengths = np.array([int(tests[-1]) for tests, _ in tables], dtype=np.int64)
+    return DiscoveryCurves(run_nums, np.arange(1, faults.shape[1] + 1), faults, lengths, digest.hexdigest())
+
+
+def widen(curves, width):
+    """DiscoveryCurves extended to `width` test cases, every run keeping its final count."""
+    extra = width - curves.faults.shape[1]
+    if extra <= 0:
+        return curves
+    faults = np.pad(curves.faults, ((0, 0), (0, extra)), mode='edge') if curves.faults.shape[1] else \
+        np.zeros((curves.faults.shape[0], width))
+    return curves._replace(tests=np.arange(1, width + 1), faults=faults)
+
+
+def discovery_bands(curves, bands=DEFAULT_BANDS):
+    """CurveBands of DiscoveryCurves; all arrays are NaN-free once there is at least one run."""
+    faults = curves.faults
+    if faults.shape[0] == 0:
+        empty = np.zeros(faults.shape[1])
+        return CurveBands(curves.tests, empty, empty, {band: (empty, empty) for band in bands}, empty, 0)
+    levels = sorted({q for band in bands for q in band})
+    values = dict(zip(levels, np.quantile(faults, levels, axis=0)))
+    return CurveBands(
+        tests=curves.tests,
+        mean=faults.mean(axis=0),
+        median=np.median(faults, axis=0),
+        bands={band: (values[band[0]], values[band[1]]) for band in bands},
+        active=(curves.lengths[:, None] >= curves.tests[None, :]).sum(axis=0),
+        runs=faults.shape[0],
+    )
+
+
+def figure_digest(curves, bands=DEFAULT_BANDS, title=""):
+    """Hash of everything a comparison figure depends on; curves is {label: DiscoveryCurves}."""
+    digest = hashlib.sha256(repr((FIGURE_VERSION, title, tuple(bands))).encode('utf-8'))
+    for label, tool_curves in curves.items():
+        digest.update(f"{label}:{tool_curves.digest}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def plot_discovery_curves(curves, path, bands=DEFAULT_BANDS, title=""):
+    """
+    Write a PNG comparing the mean and median discovery curves and quantile
+    bands of every tool in curves ({label: DiscoveryCurves}). The figure is
+    only redrawn when figure_digest differs from the one stored in
+    `<path>.sha256`. Returns 'cached', 'written', or None if matplotlib is not
+    installed.
+    """
+    path = Path(path)
+    digest_file = path.with_name(path.name + ".sha256")
+    digest = figure_digest(curves, bands, title)
+    try:
+        if path.exists() and digest_file.read_text().strip() == digest:
+            return 'cached'
+    except OSError:
+        pass
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for label, tool_curves in curves.items():
+        summary = discovery_bands(tool_curves, bands)
+        line, = ax.plot(summary.tests, summary.mean, marker='o', markersize=3,
+                        label=f"{label} mean ({summary.runs} runs)")
+        ax.plot(summary.tests, summary.median, linestyle='--', color=line.get_color(), label=f"{label} median")
+        for i, (band, (low, high)) in enumerate(sorted(summary.bands.items())):
+            ax.fill_between(summary.tests, low, high, color=line.get_color(), alpha=0.12 + 0.08 * i, linewidth=0,
+                            label=f"{label} {band[0]:.0%}-{band[1]:.0%}")
+    ax.set_xlabel("Test case")
+    ax.set_ylabel("Cumulative unique faults")
+    if title:
+        ax.set_title(title)
+    ax.grid(alpha=0.3)
+    ax.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+    digest_file.write_text(digest + "\n")
+    return 'written'
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fault-discovery AUC computed directly from each run's fault_discovery_rate.csv.
+
+The CSV holds the cumulative number of unique faults after every test case.
+The experiment VM's script scores a run as
+    actual_area / perfect_area
+where actual_area is the trapezoidal area under the cumulative curve (one unit
+per test interval), and perfect_area = max_faults * (tests - 1), the area if
+every fault had been found by the first test. fault-auc.txt is a verbose dump
+of that computation, ending with the score rounded to 4 decimals.
+
+Curves of all runs are edge-padded into one (runs, max_tests) matrix, so the
+scores of a whole tool are a handful of array reductions.
+"""
+
+import csv
+
+import numpy as np
+
+FAULT_CSV = "fault_discovery_rate.csv"
+
+# fault-auc.txt prints the score with 4 decimals.
+TEXT_SCORE_TOLERANCE = 0.5e-4 + 1e-9
+
+
+def parse_discovery_table(lines):
+    """
+    (test case numbers, cumulative unique faults) int arrays, ordered by test
+    case number, from the lines of a fault_discovery_rate.csv. Returns None if
+    there are no rows or a row is malformed.
+    """
+    reader = csv.reader(lines)
+    if next(reader, None) is None:
+        return None
+    try:
+        rows = sorted((int(test), int(faults)) for test, faults in (row[:2] for row in reader if row))
+    except ValueError:
+        return None
+    if not rows:
+        return None
+    table = np.array(rows, dtype=np.int64)
+    return table[:, 0], table[:, 1]
+
+
+def read_discovery_curve(file_path):
+    """
+    Cumulative unique faults after each test case, ordered by test case number,
+    as an int array. Returns None if the file is missing, empty or malformed.
+    """
+    try:
+        with open(file_path, 'r', newline='') as f:
+            table = parse_discovery_table(f)
+    except OSError:
+        return None
+    return None if table is None else table[1]
+
+
+def pad_curves(curves):
+    """
+    Stack 1-D curves of different lengths into a (runs, max_len) float matrix,
+    padding each row with its last value. Returns (matrix, lengths).
+    """
+    lengths = np.array([len(curve) for curve in curves], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(curves), max(width, 1)))
+    for row, curve in enumerate(curves):
+        if len(curve):
+            matrix[row, :len(curve)] = curve
+            matrix[row, len(curve):] = curve[-1]
+    return matrix, lengths
+
+
+def fault_auc_scores(curves):
+    """
+    Normalized trapezoidal fault-discovery scores of a list of cumulative curves.
+    Returns a float array; NaN where the score is undefined (fewer than two
+    tests or no fault found, i.e. perfect_area == 0).
+    """
+    if not curves:
+        return np.zeros(0)
+    matrix, lengths = pad_curves(curves)
+    intervals = np.arange(matrix.shape[1] - 1) < (lengths - 1)[:, None]
+    actual_area = ((matrix[:, 1:] + matrix[:, :-1]) / 2 * intervals).sum(axis=1)
+    perfect_area = matrix.max(axis=1) * (lengths - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(perfect_area > 0, actual_area / perfect_area, np.nan)
+
+
+def find_mismatches(csv_scores, text_scores, tolerance=TEXT_SCORE_TOLERANCE):
+    """
+    [(run_num, csv_score, text_score)] for the runs where both scores exist and
+    differ by more than the text score's rounding. Both arguments are
+    {run_num: score} dicts.
+    """
+    return [
+        (run_num, csv_scores[run_num], text_scores[run_num])
+        for run_num in sorted(set(csv_scores) & set(text_scores))
+        if abs(csv_scores[run_num] - text_scores[run_num]) > tolerance
+    ]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Fault normalization: strip the transient parts of a fault line (API cache
+busters, JS line/column numbers, versioned bundle names) so that the same
+fault groups together across runs.
+
+An app profile declares its rules as a list whose entries are either the name
+of a rule in FAULT_RULES or an explicit (regex, replacement) pair. New named
+rules can be plugged in with register_rule().
+
+FaultNormalizer compiles a rule list into ONE alternation regex of named
+groups, so each line is scanned once instead of once per rule, and memoizes
+the result per distinct line: the same fault lines repeat in every run of a
+campaign, so most lines of a large campaign are dictionary hits.
+
+The single pass applies the rules leftmost-first rather than one after
+another. That gives the same result as long as no rule only matches text
+produced by an earlier rule, which holds for the built-in rules; a rule list
+that needs chaining can pass sequential=True.
+"""
+
+import re
+
+# Named rules; profiles refer to them by name.
+FAULT_RULES = {
+    'api_timestamp': (r'\?_=\d+', ''),           # API cache busters, e.g. "?_=1754757917"
+    'js_line_col': (r'\s\d+:\d+', ''),           # JavaScript line and column numbers, e.g. " 30:42692"
+    'versioned_js': (r'(\.\d+)+\.js', '.js'),    # version/hash in JS filenames, e.g. "app.0.10.0.js"
+}
+
+# Distinct lines remembered per normalizer before the memo is cleared.
+DEFAULT_MEMO_SIZE = 1 << 20
+
+
+def register_rule(name, pattern, replacement=''):
+    """Add (or replace) a named rule that profiles can list by name."""
+    re.compile(pattern)
+    FAULT_RULES[name] = (pattern, replacement)
+
+
+def resolve_rules(rules):
+    """List of (regex, replacement) pairs of a rule list that may contain rule names."""
+    resolved = []
+    for rule in rules:
+        if isinstance(rule, str):
+            if rule not in FAULT_RULES:
+                raise ValueError(f"Unknown fault normalization rule '{rule}' (known: {', '.join(sorted(FAULT_RULES))})")
+            resolved.append(FAULT_RULES[rule])
+        else:
+            pattern, replacement = rule
+            resolved.append((pattern, replacement))
+    return resolved
+
+
+class FaultNormalizer:
+    """
+    Compiled, memoized normalization of fault lines for one rule list.
+    normalize(line) applies the rules and strips surrounding whitespace.
+    """
+
+    def __init__(self, rules, sequential=False, memo_size=DEFAULT_MEMO_SIZE):
+        self.rules = resolve_rules(rules)
+        self.sequential = sequential
+        self.memo_size = memo_size
+        self._memo = {}
+        self._compiled = [(re.compile(pattern), replacement) for pattern, replacement in self.rules]
+        self._combined = None
+        if self.rules and not sequential:
+            self._combined = re.compile("|".join(
+                f"(?P<_r{i}>{pattern})" for i, (pattern, _) in enumerate(self.rules)
+            ))
+            self._replacements = {f"_r{i}": rule for i, rule in enumerate(self._compiled)}
+
+    def _replace(self, match):
+        pattern, replacement = self._replacements[match.lastgroup]
+        if '\\' not in replacement:
+            return replacement
+        # Backreferences are numbered within the rule's own pattern.
+        return pattern.sub(replacement, match.group(), count=1)
+
+    def _apply(self, line):
+        if self._combined is not None:
+            line = self._combined.sub(self._replace, line)
+        else:
+            for pattern, replacement in self._compiled:
+                line = pattern.sub(replacement, line)
+        return line.strip()
+
+    def normalize(self, line):
+        """Normalized form of one fault line."""
+        result = self._memo.get(line)
+        if result is None:
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            result = self._memo[line] = self._apply(line)
+        return result
+
+    def normalize_all(self, lines):
+        """Set of the normalized forms of an iterable of lines."""
+        return {self.normalize(line) for line in lines}
+
+
+_normalizers = {}
+
+
+def get_normalizer(rules, sequential=False):
+    """Shared FaultNormalizer of a rule list, so the memo is reused across runs and tools."""
+    key = (tuple(rule if isinstance(rule, str) else tuple(rule) for rule in rules), sequential)
+    normalizer = _normalizers.get(key)
+    if normalizer is None:
+        normalizer = _normalizers[key] = FaultNormalizer(rules, sequential=sequential)
+    return normalizer
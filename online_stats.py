@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Mergeable online summaries of per-run metrics.
+
+OnlineSummary is updated one value at a time and never keeps more than a
+bounded number of values:
+- count, min, max, and mean/variance via Welford's algorithm. These merge
+  exactly (Chan et al.'s parallel update). The mean is read from a
+  compensated (Neumaier) running sum, so it matches statistics.mean to the
+  last digit without keeping exact fractions.
+- quantiles via a KLL sketch. While a summary has seen at most `k` values
+  the sketch holds them all, so quantiles are exact and match the
+  statistics module. Beyond that, values are compacted into weighted
+  levels, and quantiles become approximate with a rank error of
+  roughly 1/k.
+
+Summaries built by parallel workers, by earlier sessions (see to_state /
+from_state) or per shard can be combined with merge().
+"""
+
+import math
+from fractions import Fraction
+
+DEFAULT_K = 200
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch. Level h holds items of weight 2**h; a level that grows
+    beyond its capacity is sorted and every other item is promoted to the next
+    level. The offset of the promoted half alternates per level instead of
+    being random, so sketches are deterministic.
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.levels = [[]]
+        self.offsets = [0]
+
+    def _capacity(self, level):
+        # Lower levels get geometrically smaller capacities (c = 2/3), at least 2 items.
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                    self.offsets.append(0)
+                items.sort()
+                offset = self.offsets[level]
+                self.offsets[level] ^= 1
+                # An odd item stays behind so no weight is lost.
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, value):
+        self.levels[0].append(value)
+        if len(self.levels[0]) > self._capacity(0):
+            self._compact()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self.offsets.append(0)
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self._compact()
+
+    @property
+    def exact(self):
+        """True while no value has been compacted away."""
+        return all(not items for items in self.levels[1:])
+
+    def weighted_items(self):
+        """Sorted [(value, weight)] of everything the sketch retains."""
+        return sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+
+
+def _exclusive_quantiles(data, n):
+    """statistics.quantiles(data, n=n) (method 'exclusive') for sorted data with len >= 2."""
+    ld = len(data)
+    m = ld + 1
+    result = []
+    for i in range(1, n):
+        j = i * m // n
+        j = 1 if j < 1 else ld - 1 if j > ld - 1 else j
+        delta = i * m - j * n
+        result.append((data[j - 1] * (n - delta) + data[j] * delta) / n)
+    return result
+
+
+def _weighted_quantile(items, q):
+    """Quantile q of sorted weighted items, interpolating between item midpoints."""
+    total = sum(weight for _, weight in items)
+    target = q * total
+    cumulative = 0
+    previous_mid, previous_value = None, None
+    for value, weight in items:
+        mid = cumulative + weight / 2
+        if mid >= target:
+            if previous_mid is None:
+                return value
+            fraction = (target - previous_mid) / (mid - previous_mid)
+            return previous_value + (value - previous_value) * fraction
+        previous_mid, previous_value = mid, value
+        cumulative += weight
+    return items[-1][0]
+
+
+class OnlineSummary:
+    """
+    Streaming count/mean/std/min/max/quantile summary of one metric.
+    update() adds a value, merge() combines summaries.
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.count = 0
+        self.total = 0.0
+        self.carry = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = KLLSketch(k)
+
+    @classmethod
+    def from_values(cls, values, k=DEFAULT_K):
+        summary = cls(k)
+        for value in values:
+            summary.update(value)
+        return summary
+
+    def _add(self, value):
+        # Neumaier summation: carry collects the low-order bits lost by total.
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.carry += (self.total - total) + value
+        else:
+            self.carry += (value - total) + self.total
+        self.total = total
+
+    def _running_mean(self):
+        return (self.total + self.carry) / self.count if self.count else 0.0
+
+    def update(self, value):
+        # Welford's online mean/variance update.
+        delta = value - self._running_mean()
+        self.count += 1
+        self._add(value)
+        self.m2 += delta * (value - self._running_mean())
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.update(value)
+
+    def merge(self, other):
+        """Fold another summary into this one (moments exactly, quantiles approximately)."""
+        if other.count == 0:
+            return self
+        delta = other._running_mean() - self._running_mean()
+        self.m2 += other.m2 + delta * delta * self.count * other.count / (self.count + other.count)
+        self.count += other.count
+        self._add(other.total)
+        self._add(other.carry)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def mean(self):
+        if not self.count:
+            return 0.0
+        # total + carry holds the sum to about twice float precision; dividing it
+        # exactly rounds the mean once, like statistics.mean does.
+        return float((Fraction(self.total) + Fraction(self.carry)) / self.count)
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1 denominator), 0 for fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(max(self.variance, 0.0))
+
+    def quantiles(self, n=4):
+        """
+        Cut points dividing the values into n groups, like statistics.quantiles
+        (exclusive method). Exact while the sketch has not compacted anything.
+        """
+        if self.count < 2:
+            return [self.mean] * (n - 1) if self.count else []
+        items = self.sketch.weighted_items()
+        if self.sketch.exact:
+            return _exclusive_quantiles([value for value, _ in items], n)
+        return [_weighted_quantile(items, i / n) for i in range(1, n)]
+
+    @property
+    def median(self):
+        if self.count == 0:
+            return 0
+        if self.count == 1:
+            return self.mean
+        return self.quantiles(2)[0]
+
+    def to_state(self):
+        """Plain-data snapshot (JSON serialisable) for persisting partial summaries."""
+        return {
+            'count': self.count, 'total': self.total, 'carry': self.carry, 'm2': self.m2,
+            'min': self.min, 'max': self.max,
+            'k': self.sketch.k, 'levels': self.sketch.levels, 'offsets': self.sketch.offsets,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        summary = cls(state['k'])
+        summary.count, summary.m2 = state['count'], state['m2']
+        summary.total, summary.carry = state['total'], state['carry']
+        summary.min, summary.max = state['min'], state['max']
+        summary.sketch.levels = [list(items) for items in state['levels']]
+        summary.sketch.offsets = list(state['offsets'])
+        return summary
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Prefix stability: would the comparison have reached the same conclusions with
+only the first k runs of each tool?
+
+Everything is computed for every prefix k in one pass over the runs:
+- per-metric summaries come from OnlineSummary objects that are updated run by
+  run and read out after each prefix;
+- every (metric, prefix) Mann-Whitney U test and A12 goes into one vectorized
+  rank_stats call;
+- branch and fault unions come from a cumulative bitwise-OR down the run axis
+  of the packed per-run bitsets.
+
+This replaces keeping copies of smaller campaigns (e.g. past15runs/) just to
+check whether conclusions change with more runs.
+"""
+
+import numpy as np
+
+from coverage_matrix import popcount
+from online_stats import OnlineSummary
+from rank_stats import mann_whitney_u
+
+DEFAULT_MIN_RUNS = 5
+SIGNIFICANCE = 0.05
+
+
+def prefix_points(first, last, max_points=50):
+    """
+    Prefix lengths to evaluate: every k from `first` to `last` for short
+    campaigns, otherwise about `max_points` geometrically spaced values
+    (always including both ends).
+    """
+    first = max(1, min(first, last))
+    if last - first + 1 <= max_points:
+        return list(range(first, last + 1))
+    return sorted({int(round(value)) for value in np.geomspace(first, last, max_points)})
+
+
+def prefix_summaries(values, prefixes):
+    """
+    Mean and median of values[:k] for every k in prefixes (sorted), from one
+    OnlineSummary updated value by value. Returns (means, medians) arrays.
+    """
+    summary = OnlineSummary()
+    means, medians = [], []
+    wanted = iter(prefixes)
+    target = next(wanted, None)
+    for count, value in enumerate(values, start=1):
+        summary.update(value)
+        while target is not None and count == target:
+            means.append(summary.mean)
+            medians.append(summary.median)
+            target = next(wanted, None)
+    while target is not None:
+        means.append(np.nan)
+        medians.append(np.nan)
+        target = next(wanted, None)
+    return np.array(means, dtype=float), np.array(medians, dtype=float)
+
+
+def prefix_unions(baseline_bits, enhanced_bits, prefixes):
+    """
+    Union sizes of the first k rows of two packed (runs, bytes) bitset matrices
+    over the same item index, for every k: {'baseline', 'enhanced',
+    'only_baseline', 'only_enhanced'} arrays (NaN where a tool has fewer runs).
+    """
+    def cumulative(bits):
+        bits = np.asarray(bits, dtype=np.uint8)
+        return np.bitwise_or.accumulate(bits, axis=0) if len(bits) else bits
+
+    baseline_acc, enhanced_acc = cumulative(baseline_bits), cumulative(enhanced_bits)
+    result = {key: np.full(len(prefixes), np.nan) for key in ('baseline', 'enhanced', 'only_baseline', 'only_enhanced')}
+    for i, k in enumerate(prefixes):
+        if k > len(baseline_acc) or k > len(enhanced_acc):
+            continue
+        b, e = baseline_acc[k - 1], enhanced_acc[k - 1]
+        result['baseline'][i] = popcount(b)
+        result['enhanced'][i] = popcount(e)
+        result['only_baseline'][i] = popcount(b & ~e)
+        result['only_enhanced'][i] = popcount(e & ~b)
+    return result
+
+
+def prefix_metric_tests(baseline_values, enhanced_values, alternatives, prefixes):
+    """
+    Mann-Whitney U (Enhanced vs Baseline) and A12 of the first k values of each
+    metric, for every metric and prefix, in a single vectorized call.
+    baseline_values / enhanced_values are {metric: values in run order} and
+    alternatives {metric: alternative}. Returns {metric: {'p_value', 'a12',
+    'baseline_mean', 'enhanced_mean', 'baseline_median', 'enhanced_median'}}
+    with one array entry per prefix.
+    """
+    metrics = list(alternatives)
+    x_samples, y_samples, alternative_list = [], [], []
+    for metric in metrics:
+        for k in prefixes:
+            x_samples.append(enhanced_values[metric][:k])
+            y_samples.append(baseline_values[metric][:k])
+            alternative_list.append(alternatives[metric])
+    mwu = mann_whitney_u(x_samples, y_samples, alternative=alternative_list)
+
+    results = {}
+    for row, metric in enumerate(metrics):
+        block = slice(row * len(prefixes), (row + 1) * len(prefixes))
+        baseline_mean, baseline_median = prefix_summaries(baseline_values[metric], prefixes)
+        enhanced_mean, enhanced_median = prefix_summaries(enhanced_values[metric], prefixes)
+        results[metric] = {
+            'p_value': mwu.p_value[block],
+            'a12': mwu.a12[block],
+            'baseline_mean': baseline_mean,
+            'enhanced_mean': enhanced_mean,
+            'baseline_median': baseline_median,
+            'enhanced_median': enhanced_median,
+        }
+    return results
+
+
+def conclusion(p_value, a12, alpha=SIGNIFICANCE):
+    """'Enhanced' / 'Baseline' when significant (by A12 direction), 'n.s.' otherwise, '-' without data."""
+    if np.isnan(p_value):
+        return "-"
+    if p_value >= alpha:
+        return "n.s."
+    return "Enhanced" if a12 > 0.5 else "Baseline"
+
+
+def stable_from(conclusions, prefixes):
+    """
+    Smallest prefix from which every later conclusion equals the one at the
+    last prefix (None if there are no prefixes).
+    """
+    if not prefixes:
+        return None
+    final = conclusions[-1]
+    stable = prefixes[-1]
+    for k, value in zip(reversed(prefixes), reversed(conclusions)):
+        if value != final:
+            break
+        stable = k
+    return stable
+
+
+def plot_prefix_stability(stability, labels, path):
+    """
+    Write a PNG with A12 and p-value against the number of runs for every metric,
+    and the branch/fault union sizes of both tools. Uses matplotlib's Agg
+    backend, imported lazily; returns False if matplotlib is not installed.
+    """
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+
+    prefixes = stability['prefixes']
+    fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+    for metric, label in labels.items():
+        tests = stability['metrics'][metric]
+        axes[0, 0].plot(prefixes, tests['a12'], marker='o', markersize=3, label=label)
+        axes[0, 1].plot(prefixes, tests['p_value'], marker='o', markersize=3, label=label)
+    axes[0, 0].axhline(0.5, color='grey', linestyle='--', linewidth=1)
+    axes[0, 0].set_ylabel("A12 (Enhanced vs Baseline)")
+    axes[0, 1].axhline(SIGNIFICANCE, color='grey', linestyle='--', linewidth=1)
+    axes[0, 1].set_yscale('log')
+    axes[0, 1].set_ylabel("p-value")
+    for ax, unions, title in ((axes[1, 0], stability['branches'], "Branches hit"),
+                              (axes[1, 1], stability['faults'], "Fault types found")):
+        ax.plot(prefixes, unions['baseline'], label="Baseline")
+        ax.plot(prefixes, unions['enhanced'], label="Enhanced")
+        ax.set_ylabel(title)
+    for ax in axes.ravel():
+        ax.set_xlabel("Runs")
+        ax.grid(alpha=0.3)
+        ax.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+    return True
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite store of per-run facts for incremental re-analysis.
+
+Every ingested run keeps its branch hits, AUC values, raw fault lines and
+test-pattern features, together with a signature of the files they came from.
+On the next invocation only runs that are new (or whose files changed) have to
+be parsed; everything else is read back from the database. Every table is
+derived from the run directories, so a database written with another schema
+version is simply dropped and rebuilt.
+
+Fault lines are stored as found in unique_faults.txt, so changing an app's
+normalization rules never requires re-ingesting.
+"""
+
+import datetime
+import os
+import sqlite3
+
+import numpy as np
+
+from coverage_ingest import CoverageLayout, shared_layout
+
+DEFAULT_RESULTS_DB = "msc_results.db"
+# Also bump when the way stored values are computed changes, so existing stores
+# are rebuilt (3: fault scores computed from fault_discovery_rate.csv).
+SCHEMA_VERSION = 3
+
+# Tables dropped when the schema version changes, referencing tables first
+# (branch_frequency only exists in schema 1 databases).
+TABLES = ('test_features', 'faults', 'branch_frequency', 'branch_hits', 'branches', 'runs')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    run_num INTEGER NOT NULL,
+    run_dir TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    has_coverage INTEGER NOT NULL,
+    fault_score REAL,
+    final_coverage REAL,
+    coverage_auc REAL,
+    ingested_at TEXT NOT NULL,
+    UNIQUE (app, tool, run_num)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_tool ON runs (tool, app);
+
+CREATE TABLE IF NOT EXISTS branches (
+    branch_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    branch_key TEXT NOT NULL,
+    path_index INTEGER NOT NULL,
+    line INTEGER,
+    col INTEGER,
+    branch_type TEXT,
+    function_name TEXT,
+    UNIQUE (file_path, branch_key, path_index)
+);
+
+CREATE TABLE IF NOT EXISTS branch_hits (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    branch_id INTEGER NOT NULL REFERENCES branches (branch_id),
+    hits INTEGER NOT NULL,
+    PRIMARY KEY (run_id, branch_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_branch_hits_branch ON branch_hits (branch_id);
+
+CREATE TABLE IF NOT EXISTS faults (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    fault TEXT NOT NULL,
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS test_features (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    suite_index INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, suite_index, kind, position)
+) WITHOUT ROWID;
+"""
+
+
+def run_signature(run):
+    """
+    Fingerprint of a RunEntry's files (name, size, mtime) at run and suite level.
+    Any added, removed or rewritten file changes the signature.
+    """
+    parts = []
+    dirs = [(run.run_dir, run.files)] + [(suite.suite_dir, suite.files) for suite in run.suites]
+    for directory, files in dirs:
+        for name in sorted(files):
+            try:
+                st = os.stat(directory / name)
+            except OSError:
+                continue
+            parts.append(f"{directory.name}/{name}:{st.st_size}:{st.st_mtime_ns}")
+    return "|".join(parts)
+
+
+class ResultsStore:
+    """
+    SQLite database of ingested runs. The connection is opened lazily and is
+    not pickled, so instances can be handed to worker processes like a
+    CoverageCache; SQLite's locking serialises concurrent writers.
+    """
+
+    def __init__(self, path=DEFAULT_RESULTS_DB):
+        self.path = str(path)
+        self._conn = None
+        self._branch_cache = {}
+
+    def __getstate__(self):
+        return {'path': self.path, '_conn': None, '_branch_cache': {}}
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                print(f"🔄 {self.path} uses results schema {version}, expected {SCHEMA_VERSION}: "
+                      "rebuilding it from the run directories")
+                for table in TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.commit()
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def ingested_runs(self, app, tool):
+        """{run_num: signature} of the runs already stored for app/tool."""
+        rows = self.conn.execute(
+            "SELECT run_num, signature FROM runs WHERE app = ? AND tool = ?", (app, tool))
+        return dict(rows.fetchall())
+
+    def _branch_ids(self, layout):
+        """Intern the layout's branch keys (with their locations) and return their ids."""
+        missing = [key for key in layout.branch_keys if key not in self._branch_cache]
+        if missing:
+            rows = []
+            for key in missing:
+                line, column, branch_type, function_name = layout.locations.get(key, (None, None, None, None))
+                rows.append((key[0], key[1], key[2], line, column, branch_type, function_name))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO branches (file_path, branch_key, path_index, line, col, branch_type, function_name)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            for file_path, branch_key, path_index, branch_id in self.conn.execute(
+                    "SELECT file_path, branch_key, path_index, branch_id FROM branches"):
+                self._branch_cache[(file_path, branch_key, path_index)] = branch_id
+        return [self._branch_cache[key] for key in layout.branch_keys]
+
+    def remove_run(self, app, tool, run_num):
+        """Delete a stored run; its hits, faults and test features go with it."""
+        self.conn.execute("DELETE FROM runs WHERE app = ? AND tool = ? AND run_num = ?", (app, tool, run_num))
+
+    def ingest_run(self, app, tool, run_num, run_dir, signature, run_coverage,
+                   fault_score, final_coverage, coverage_auc, fault_lines, test_features):
+        """
+        Store one run, replacing any previous version of it.
+        run_coverage may be None (no coverage-final.json); only branches with
+        hits > 0 are stored. test_features is a list of (suite_index, features)
+        pairs as produced by the engine's extract_test_features.
+        Call commit() once a batch of runs has been ingested.
+        """
+        self.remove_run(app, tool, run_num)
+        conn = self.conn
+        cursor = conn.execute(
+            "INSERT INTO runs (app, tool, run_num, run_dir, signature, has_coverage,"
+            " fault_score, final_coverage, coverage_auc, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (app, tool, run_num, str(run_dir), signature, run_coverage is not None,
+             fault_score, final_coverage, coverage_auc, datetime.datetime.now().isoformat(timespec='seconds')))
+        run_id = cursor.lastrowid
+
+        if run_coverage is not None:
+            branch_ids = self._branch_ids(run_coverage['layout'])
+            hits = run_coverage['branches'].tolist()
+            hit_rows = [(run_id, branch_id, count) for branch_id, count in zip(branch_ids, hits) if count > 0]
+            conn.executemany("INSERT INTO branch_hits (run_id, branch_id, hits) VALUES (?, ?, ?)", hit_rows)
+
+        conn.executemany(
+            "INSERT INTO faults (run_id, position, fault) VALUES (?, ?, ?)",
+            [(run_id, position, fault) for position, fault in enumerate(fault_lines)])
+
+        feature_rows = []
+        for suite_index, features in test_features:
+            feature_rows.append((run_id, suite_index, 'length', 0, '', features['length']))
+            for kind, key in (('method', 'methods'), ('parameter', 'parameters')):
+                for position, (name, count) in enumerate(features[key].items()):
+                    feature_rows.append((run_id, suite_index, kind, position, name, count))
+        conn.executemany(
+            "INSERT INTO test_features (run_id, suite_index, kind, position, name, count) VALUES (?, ?, ?, ?, ?, ?)",
+            feature_rows)
+
+    def commit(self):
+        self.conn.commit()
+
+    def _run_ids(self, app, tool, run_nums, coverage_only=False):
+        """[(run_num, run_id)] of the stored runs among run_nums, in run order."""
+        query = "SELECT run_num, run_id FROM runs WHERE app = ? AND tool = ?"
+        if coverage_only:
+            query += " AND has_coverage"
+        wanted = set(run_nums)
+        return [row for row in self.conn.execute(query + " ORDER BY run_num", (app, tool)) if row[0] in wanted]
+
+    def load_coverage_files(self, app, tool, run_nums):
+        """
+        Rebuild the engine's [(run_num, run_coverage)] list from the stored hits.
+        All runs share one layout made of the branches any of them hit.
+        """
+        runs = self._run_ids(app, tool, run_nums, coverage_only=True)
+        if not runs:
+            return []
+        conn = self.conn
+        run_ids = [run_id for _, run_id in runs]
+        placeholders = ",".join("?" * len(run_ids))
+        hit_rows = conn.execute(
+            f"SELECT run_id, branch_id, hits FROM branch_hits WHERE run_id IN ({placeholders})", run_ids).fetchall()
+
+        branch_rows = conn.execute(
+            "SELECT branch_id, file_path, branch_key, path_index, line, col, branch_type, function_name"
+            f" FROM branches WHERE branch_id IN (SELECT DISTINCT branch_id FROM branch_hits WHERE run_id IN ({placeholders}))"
+            " ORDER BY file_path, branch_key, path_index", run_ids).fetchall()
+        columns = {}
+        branch_keys = []
+        locations = {}
+        for branch_id, file_path, branch_key, path_index, line, column, branch_type, function_name in branch_rows:
+            key = (file_path, branch_key, path_index)
+            columns[branch_id] = len(branch_keys)
+            branch_keys.append(key)
+            if line is not None:
+                locations[key] = (line, column, branch_type, function_name)
+        layout = shared_layout(CoverageLayout(branch_keys, [], [], locations))
+
+        rows = {run_id: row for row, run_id in enumerate(run_ids)}
+        hits = np.zeros((len(run_ids), len(branch_keys)), dtype=np.int64)
+        for run_id, branch_id, count in hit_rows:
+            hits[rows[run_id], columns[branch_id]] = count
+
+        empty = np.zeros(0, dtype=np.int64)
+        return [
+            (run_num, {'layout': layout, 'branches': hits[row], 'statements': empty, 'functions': empty})
+            for row, (run_num, _) in enumerate(runs)
+        ]
+
+    def load_auc_data(self, app, tool, run_nums, auc_data, add_value):
+        """
+        Fill an empty AUC data dict (the engine's new_auc_data()) from the stored
+        runs, one run at a time; add_value(auc_data, key, value, run_num) records a metric.
+        """
+        wanted = set(run_nums)
+        rows = self.conn.execute(
+            "SELECT run_num, fault_score, final_coverage, coverage_auc FROM runs"
+            " WHERE app = ? AND tool = ? ORDER BY run_num", (app, tool))
+        for run_num, fault_score, final_coverage, coverage_auc in rows:
+            if run_num not in wanted:
+                continue
+            if fault_score is not None:
+                add_value(auc_data, 'fault_scores', fault_score, run_num)
+                auc_data['run_numbers'].append(run_num)
+            if final_coverage is not None:
+                add_value(auc_data, 'branch_coverage_final', final_coverage, run_num)
+            if coverage_auc is not None:
+                add_value(auc_data, 'branch_coverage_auc', coverage_auc, run_num)
+        return auc_data
+
+    def load_fault_lines(self, app, tool, run_nums):
+        """{run_num: [raw fault lines]} of the stored runs."""
+        fault_lines = {run_num: [] for run_num, _ in self._run_ids(app, tool, run_nums)}
+        rows = self.conn.execute(
+            "SELECT r.run_num, f.fault FROM faults f JOIN runs r ON r.run_id = f.run_id"
+            " WHERE r.app = ? AND r.tool = ? ORDER BY r.run_num, f.position", (app, tool))
+        for run_num, fault in rows:
+            if run_num in fault_lines:
+                fault_lines[run_num].append(fault)
+        return fault_lines
+
+    def load_test_features(self, app, tool, run_nums):
+        """{run_num: [features per suite]} in the format of the engine's extract_test_features."""
+        test_features = {}
+        suites = {}
+        rows = self.conn.execute(
+            "SELECT r.run_num, t.suite_index, t.kind, t.name, t.count FROM test_features t"
+            " JOIN runs r ON r.run_id = t.run_id WHERE r.app = ? AND r.tool = ?"
+            " ORDER BY r.run_num, t.suite_index, t.kind, t.position", (app, tool))
+        wanted = set(run_nums)
+        for run_num, suite_index, kind, name, count in rows:
+            if run_num not in wanted:
+                continue
+            features = suites.get((run_num, suite_index))
+            if features is None:
+                features = {'length': 0, 'methods': {}, 'parameters': {}}
+                suites[(run_num, suite_index)] = features
+                test_features.setdefault(run_num, []).append(features)
+            if kind == 'length':
+                features['length'] = count
+            elif kind == 'method':
+                features['methods'][name] = count
+            else:
+                features['parameters'][name] = count
+        return test_features
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Run discovery for experiment result trees.
+
+A tool's results live in `<app>-<tool>-<N>-run-cc/<run>/`, with one or more
+`test<app>LLM_<k>/` test-suite folders per run. scan_tool_runs walks such a tree
+once with os.scandir and records which files every run and suite contains, so
+the loaders can share a single RunManifest instead of probing the filesystem
+with exists() calls for a hard-coded range of run numbers.
+"""
+
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+DEFAULT_TOOL_DIR_PATTERN = r"{app}-{tool}-(\d+)-run-cc"
+DEFAULT_SUITE_PATTERN = r"test{app}LLM_(\d+)"
+
+SuiteEntry = namedtuple('SuiteEntry', ['index', 'suite_dir', 'files'])
+RunEntry = namedtuple('RunEntry', ['run_num', 'run_dir', 'files', 'suites'])
+
+
+def _scan_dir(path):
+    """Return ({file names}, {dir name: path}) for one directory, in a single scandir pass."""
+    files = set()
+    dirs = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                dirs[entry.name] = Path(entry.path)
+            else:
+                files.add(entry.name)
+    return files, dirs
+
+
+def _compile_pattern(pattern, **names):
+    """Fill the {app}/{tool} placeholders of a directory-name regex with escaped values."""
+    escaped = {key: re.escape(value) for key, value in names.items()}
+    return re.compile("^" + pattern.format(**escaped) + "$")
+
+
+def find_tool_dir(base_dir, app, tool, tool_dir_pattern=DEFAULT_TOOL_DIR_PATTERN):
+    """
+    Locate the tool directory (by default `<app>-<tool>-<N>-run-cc`) under base_dir.
+    If several campaigns exist, the one with the largest N is used.
+    Returns a Path or None.
+    """
+    pattern = _compile_pattern(tool_dir_pattern, app=app, tool=tool)
+    candidates = []
+    try:
+        _, dirs = _scan_dir(base_dir)
+    except OSError:
+        return None
+
+    for name, path in dirs.items():
+        match = pattern.match(name)
+        if match:
+            candidates.append((int(match.group(1)), path))
+
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
+class RunManifest:
+    """All runs (and their test suites) discovered for one app/tool."""
+
+    def __init__(self, app, tool, tool_dir, runs):
+        self.app = app
+        self.tool = tool
+        self.tool_dir = tool_dir
+        self.runs = runs
+
+    def __len__(self):
+        return len(self.runs)
+
+    @property
+    def run_numbers(self):
+        return [run.run_num for run in self.runs]
+
+    def run(self, run_num):
+        for run in self.runs:
+            if run.run_num == run_num:
+                return run
+        return None
+
+    def run_files(self, name):
+        """
+        Split runs by whether they contain the run-level file `name`.
+        Returns ([(run_num, path), ...], [missing paths]).
+        """
+        present, missing = [], []
+        for run in self.runs:
+            path = run.run_dir / name
+            if name in run.files:
+                present.append((run.run_num, path))
+            else:
+                missing.append(path)
+        return present, missing
+
+    def suite_files(self, name):
+        """
+        Like run_files, but for a file inside each test suite folder.
+        Returns ([(run_num, [paths, one per suite that has it]), ...], [missing paths]).
+        Runs where no suite has the file are reported as missing.
+        """
+        present, missing = [], []
+        for run in self.runs:
+            paths = [suite.suite_dir / name for suite in run.suites if name in suite.files]
+            if paths:
+                present.append((run.run_num, paths))
+            else:
+                suite_dir = run.suites[0].suite_dir if run.suites else run.run_dir / f"test{self.app}LLM_0"
+                missing.append(suite_dir / name)
+        return present, missing
+
+    def suite_dirs(self, run_num):
+        run = self.run(run_num)
+        return [suite.suite_dir for suite in run.suites] if run else []
+
+
+def scan_tool_runs(base_dir, app, tool, tool_dir_pattern=DEFAULT_TOOL_DIR_PATTERN,
+                   suite_pattern=DEFAULT_SUITE_PATTERN, max_runs=None):
+    """
+    Discover every run directory and test suite of `<app>-<tool>-*-run-cc`.
+    The directory-name regexes may contain {app}/{tool} placeholders; max_runs
+    keeps only the lowest-numbered runs.
+    Returns a RunManifest (runs sorted by number), or None if the tool
+    directory does not exist.
+    """
+    tool_dir = find_tool_dir(base_dir, app, tool, tool_dir_pattern)
+    if tool_dir is None:
+        return None
+
+    suite_pattern = _compile_pattern(suite_pattern, app=app, tool=tool)
+    runs = []
+
+    _, run_dirs = _scan_dir(tool_dir)
+    for name, run_dir in run_dirs.items():
+        if not name.isdigit():
+            continue
+
+        run_files, sub_dirs = _scan_dir(run_dir)
+        suites = []
+        for sub_name, suite_dir in sub_dirs.items():
+            match = suite_pattern.match(sub_name)
+            if match:
+                suite_files, _ = _scan_dir(suite_dir)
+                suites.append(SuiteEntry(int(match.group(1)), suite_dir, suite_files))
+
+        suites.sort()
+        runs.append(RunEntry(int(name), run_dir, run_files, suites))
+
+    runs.sort(key=lambda run: run.run_num)
+    if max_runs is not None:
+        runs = runs[:max_runs]
+    return RunManifest(app, tool, tool_dir, runs)
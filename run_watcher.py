@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Change notification for experiment result trees, used by the engine's --watch mode.
+
+On Linux, InotifyWatcher asks the kernel to report file and directory changes
+(through libc's inotify calls, so no extra package is needed); elsewhere, or if
+inotify is unavailable, PollingWatcher simply wakes up every `interval` seconds.
+Both only signal that something may have changed: the caller rescans the
+(cheap) run manifests to find out what.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Fallback watcher: every wait() reports a possible change after `interval` seconds."""
+
+    def __init__(self, interval=5.0):
+        self.interval = interval
+
+    def watch(self, paths):
+        pass
+
+    def wait(self):
+        time.sleep(self.interval)
+        return True
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    inotify-based watcher. watch() adds directories (idempotently); wait()
+    blocks until one of them changes. As a safety net for filesystems that do
+    not deliver events (e.g. network mounts), wait() also returns after
+    `rescan_interval` seconds without events.
+    """
+
+    def __init__(self, interval=5.0, rescan_interval=60.0):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.fd = fd
+        self.interval = interval
+        self.rescan_interval = rescan_interval
+        self.watched = {}
+
+    def watch(self, paths):
+        for path in paths:
+            path = str(path)
+            if path in self.watched.values():
+                continue
+            wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd >= 0:
+                self.watched[wd] = path
+
+    def _drain(self):
+        """Read all pending events; forget watches the kernel dropped (deleted directories)."""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + name_len
+                if mask & IN_IGNORED:
+                    self.watched.pop(wd, None)
+
+    def wait(self):
+        ready, _, _ = select.select([self.fd], [], [], self.rescan_interval)
+        if not ready:
+            return True
+        # Let a burst of writes (a run finishing) settle before reporting it.
+        while ready:
+            self._drain()
+            ready, _, _ = select.select([self.fd], [], [], min(self.interval, 1.0))
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(interval=5.0, polling=False):
+    """Return an InotifyWatcher where possible, otherwise a PollingWatcher."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(interval)
+        except (OSError, AttributeError, TypeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling every {interval}s")
+    return PollingWatcher(interval)
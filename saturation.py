@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Saturation (rarefaction) curves: how the union of hit branches, or of
+discovered fault types, grows as runs are added to a campaign.
+
+Each run is a packed bitset (one row of a RunBitsets-style uint8 matrix). For
+a block of random run orderings, the rows are gathered into an
+(orderings, runs, bytes) array, and np.bitwise_or.accumulate along the run
+axis gives every prefix union at once. A popcount then turns these into
+union sizes. The spread over orderings gives the confidence band at each k.
+
+The expected union at k runs also has a closed form (rarefaction): an item
+that N_i of the n runs hit is missed by a random k-subset with probability
+C(n - N_i, k) / C(n, k). expected_union() evaluates this exactly from the
+hit frequencies, so the mean curve does not depend on the number of orderings.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from coverage_matrix import popcount
+
+DEFAULT_ORDERINGS = 1000
+
+# Bounds the (orderings, runs, bytes) array built per block of orderings.
+_BLOCK_BYTES = 1 << 25
+
+RarefactionCurve = namedtuple('RarefactionCurve', ['runs', 'expected', 'mean', 'low', 'high', 'total'])
+RarefactionCurve.__doc__ = """
+Union size after k = runs[i] runs: expected (exact rarefaction expectation),
+mean/low/high over the random orderings (low/high form the confidence band) and
+total, the union size over all runs.
+"""
+
+
+def pack_sets(run_sets, items=None):
+    """
+    Packed (runs, bytes) bitsets of a list of per-run item sets (e.g. the
+    normalized fault types of each run), over `items` (by default the sorted
+    union of all items; pass a shared list to compare several tools bit by bit).
+    """
+    if items is None:
+        items = sorted(set().union(*run_sets)) if run_sets else []
+    ids = {item: i for i, item in enumerate(items)}
+    mask = np.zeros((len(run_sets), len(items)), dtype=bool)
+    for row, run_set in enumerate(run_sets):
+        mask[row, [ids[item] for item in run_set]] = True
+    return np.packbits(mask, axis=1)
+
+
+def expected_union(frequency, runs):
+    """
+    Exact expected union size of a random k-subset of `runs` runs, for k = 1..runs,
+    given how many runs hit each item (`frequency`).
+    """
+    frequency = np.asarray(frequency, dtype=np.int64)
+    frequency = frequency[frequency > 0]
+    if runs == 0:
+        return np.zeros(0)
+    log_fact = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, runs + 1, dtype=float)))])
+    counts = np.bincount(frequency, minlength=runs + 1)
+    hit_in = np.flatnonzero(counts)
+    k = np.arange(1, runs + 1)
+
+    # log C(n - f, k) - log C(n, k) for every (frequency, k); -inf where n - f < k.
+    remaining = runs - hit_in[:, None]
+    with np.errstate(invalid='ignore'):
+        log_ratio = np.where(
+            remaining >= k,
+            log_fact[np.maximum(remaining, 0)] - log_fact[np.clip(remaining - k, 0, runs)]
+            - log_fact[runs] + log_fact[runs - k],
+            -np.inf
+        )
+    missed = counts[hit_in, None] * np.exp(log_ratio)
+    return len(frequency) - missed.sum(axis=0)
+
+
+def popcount_columns(bits):
+    """Number of rows (runs) that have each bit (item) set."""
+    if bits.shape[0] == 0:
+        return np.zeros(bits.shape[1] * 8, dtype=np.int64)
+    return np.unpackbits(bits, axis=1).sum(axis=0, dtype=np.int64)
+
+
+def union_growth(bits, orderings=DEFAULT_ORDERINGS, seed=0):
+    """
+    (orderings, runs) matrix of union sizes: entry [o, k - 1] is the number of
+    items hit by the first k runs of random ordering o of the rows of `bits`.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    runs = bits.shape[0]
+    sizes = np.empty((orderings, runs), dtype=np.int64)
+    if runs == 0 or orderings == 0:
+        return sizes
+    rng = np.random.default_rng(seed)
+    block = max(1, _BLOCK_BYTES // max(1, bits.size))
+    for start in range(0, orderings, block):
+        count = min(block, orderings - start)
+        order = np.argsort(rng.random((count, runs)), axis=1)
+        prefixes = np.bitwise_or.accumulate(bits[order], axis=1)
+        sizes[start:start + count] = popcount(prefixes, axis=2)
+    return sizes
+
+
+def rarefaction_curve(bits, orderings=DEFAULT_ORDERINGS, confidence=0.95, seed=0):
+    """
+    Saturation curve of one tool from its packed per-run bitsets (runs, bytes):
+    a RarefactionCurve over k = 1..runs.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    runs = bits.shape[0]
+    frequency = popcount_columns(bits)
+    sizes = union_growth(bits, orderings, seed)
+    alpha = (1 - confidence) / 2
+    if orderings:
+        low, high = np.quantile(sizes, [alpha, 1 - alpha], axis=0)
+        mean = sizes.mean(axis=0)
+    else:
+        low = high = mean = np.full(runs, np.nan)
+    return RarefactionCurve(
+        runs=np.arange(1, runs + 1),
+        expected=expected_union(frequency, runs),
+        mean=mean,
+        low=low,
+        high=high,
+        total=int(np.count_nonzero(frequency)),
+    )
+
+
+def runs_to_reach(curve, fraction):
+    """Smallest k whose expected union reaches `fraction` of the full union (None if never)."""
+    if curve.total == 0:
+        return None
+    reached = np.flatnonzero(curve.expected >= fraction * curve.total - 1e-9)
+    return int(curve.runs[reached[0]]) if len(reached) else None
+
+
+def curve_points(runs, max_points=20):
+    """
+    Run counts to tabulate: every k for short campaigns, otherwise about
+    `max_points` geometrically spaced values, always including 1 and `runs`.
+    """
+    if runs <= max_points:
+        return list(range(1, runs + 1))
+    return sorted({int(round(value)) for value in np.geomspace(1, runs, max_points)})